@@ -0,0 +1 @@
+"""Benchmarks of the service, run in-process through the ASGI transport."""
@@ -0,0 +1,140 @@
+"""Module for summarizing benchmark results and comparing them to baselines."""
+
+import json
+import math
+from pathlib import Path
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Get a percentile of values, by the nearest rank.
+
+    Args:
+        values (list[float]): The sorted values.
+        fraction (float): The percentile, between 0 and 1.
+
+    Returns:
+        float: The value at the percentile, 0 if there are none.
+    """
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(values)))
+    return values[rank - 1]
+
+
+def summarize(
+    latencies: list[float], elapsed: float, cpu: float = 0.0
+) -> dict[str, float]:
+    """Summarize the latencies of a benchmark run.
+
+    Args:
+        latencies (list[float]): The seconds spent on each request.
+        elapsed (float): The seconds spent on the whole run.
+        cpu (float): The process CPU seconds spent on the whole run.
+
+    Returns:
+        dict[str, float]: The requests, throughput, latency percentiles and
+            CPU time per request.
+    """
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "throughput": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "cpu_ms": round(cpu / len(latencies) * 1000, 3) if latencies else 0.0,
+    }
+
+
+def get_key(result: dict) -> tuple[str, int, int]:
+    """Get the key identifying the case of a result.
+
+    Args:
+        result (dict): The benchmark result.
+
+    Returns:
+        tuple[str, int, int]: The scenario, table size and concurrency.
+    """
+    return result["scenario"], result["table_size"], result["concurrency"]
+
+
+def compare(results: list[dict], baseline: list[dict], threshold: float) -> list[str]:
+    """Compare results with a baseline.
+
+    A case regresses when its p99 latency or CPU time per request grows, or
+    its throughput drops, by more than the threshold, or when it has more
+    failed requests. Cases missing from the baseline are skipped.
+
+    Args:
+        results (list[dict]): The current results.
+        baseline (list[dict]): The baseline results.
+        threshold (float): The tolerated change, as a fraction.
+
+    Returns:
+        list[str]: A description of each regression.
+    """
+    baseline_by_key = {get_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        expected = baseline_by_key.get(get_key(result))
+        if expected is None:
+            continue
+        name = "{} (table size {}, concurrency {})".format(*get_key(result))
+        if result["p99_ms"] > expected["p99_ms"] * (1 + threshold):
+            regressions.append(
+                f"{name}: p99 {result['p99_ms']}ms, baseline {expected['p99_ms']}ms"
+            )
+        if result["throughput"] < expected["throughput"] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {result['throughput']}/s, "
+                f"baseline {expected['throughput']}/s"
+            )
+        if "cpu_ms" in expected and result["cpu_ms"] > expected["cpu_ms"] * (
+            1 + threshold
+        ):
+            regressions.append(
+                f"{name}: cpu {result['cpu_ms']}ms, baseline {expected['cpu_ms']}ms"
+            )
+        if result.get("errors", 0) > expected.get("errors", 0):
+            regressions.append(f"{name}: {result['errors']} failed requests")
+    return regressions
+
+
+def check_budget(measured: dict[str, float], budget: dict[str, float]) -> list[str]:
+    """Check measured times against a budget.
+
+    Args:
+        measured (dict[str, float]): The measured milliseconds, by name.
+        budget (dict[str, float]): The maximum milliseconds, by name.
+
+    Returns:
+        list[str]: A description of each time over its budget.
+    """
+    return [
+        f"{name}: {measured[name]}ms, budget {limit}ms"
+        for name, limit in budget.items()
+        if measured.get(name, 0.0) > limit
+    ]
+
+
+def read_results(path: Path) -> list[dict]:
+    """Read the results of a file.
+
+    Args:
+        path (Path): The results file.
+
+    Returns:
+        list[dict]: The results.
+    """
+    return json.loads(path.read_text())["results"]
+
+
+def write_results(path: Path, results: list[dict], meta: dict) -> None:
+    """Write results to a file.
+
+    Args:
+        path (Path): The results file.
+        results (list[dict]): The results.
+        meta (dict): The options and environment of the run.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"meta": meta, "results": results}, indent=2) + "\n")
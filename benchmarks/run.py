@@ -0,0 +1,287 @@
+"""Run the benchmarks of the service and compare them to the baseline.
+
+The app is driven in-process through the ASGI transport, on a database of its
+own, for every scenario, table size and concurrency level. The settings are
+read from the environment, as in the service.
+
+Usage:
+    python -m benchmarks.run --table-sizes 0 1000000 --concurrency 1 16 64
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import platform
+from pathlib import Path
+from itertools import count
+from typing import Awaitable, Callable
+
+from benchmarks.report import compare, read_results, summarize, write_results
+
+SCENARIOS = ("issue", "verify", "signup", "list")
+PASSWORD = "benchmark-password"
+BASE_URL = "http://benchmark/api"
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse the command line options.
+
+    Args:
+        argv (list[str] | None): The arguments, the process ones if None.
+
+    Returns:
+        argparse.Namespace: The options.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--table-sizes", nargs="+", type=int, default=[0, 10000])
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 16])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--seed-chunk-size", type=int, default=10000)
+    parser.add_argument(
+        "--database", type=Path, default=Path("benchmarks/data/benchmark.sql")
+    )
+    parser.add_argument(
+        "--output", type=Path, default=Path("benchmarks/results/latest.json")
+    )
+    parser.add_argument(
+        "--baseline", type=Path, default=Path("benchmarks/baseline.json")
+    )
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--update-baseline", action="store_true")
+    return parser.parse_args(argv)
+
+
+def configure_environment(database: Path) -> None:
+    """Point the service at the benchmark database, before importing it.
+
+    The login limits and the reaper are disabled, unless set explicitly.
+
+    Args:
+        database (Path): The benchmark database file.
+    """
+    database.parent.mkdir(parents=True, exist_ok=True)
+    os.environ.setdefault("CONN_URL", f"sqlite+aiosqlite:///{database}")
+    os.environ.setdefault("LOGIN_LIMIT_ENABLED", "false")
+    os.environ.setdefault("REAPER_ENABLED", "false")
+
+
+async def seed(table_size: int, chunk_size: int) -> dict:
+    """Recreate the database with the access groups and tokens of a table size.
+
+    Args:
+        table_size (int): The number of access groups and tokens seeded.
+        chunk_size (int): The number of rows inserted at once.
+
+    Returns:
+        dict: The benchmark access group credentials and id.
+    """
+    from src.database.database import Database
+    from src.database.migrations import Migrations
+    from src.database.tables import access_groups_table
+    from src.schema.access_groups import AccessGroupRequest
+    from src.schema.auth import Jwt
+    from src.schema.passw import PasswordHandler
+    from src.service.access_groups import AccessGroupsService
+    from src.service.utils import UtilsService
+    from src.store.factory import get_token_store
+
+    await Database.drop_models()
+    await Migrations.upgrade()
+
+    email = "benchmark@example.com"
+    group = await AccessGroupsService.create_access_group(
+        AccessGroupRequest(name="Benchmark", email=email, password=PASSWORD)
+    )
+    hashed_password = PasswordHandler.hash_password(PASSWORD)
+    date_created = UtilsService.get_current_datetime()
+    now = UtilsService.get_int_timestamp()
+    for start in range(0, table_size, chunk_size):
+        size = min(chunk_size, table_size - start)
+        await Database.execute_batch(
+            access_groups_table.insert(),
+            [
+                {
+                    "id": UtilsService.create_uuid(),
+                    "name": f"Seed {index}",
+                    "email": f"seed-{index}@example.com",
+                    "password": hashed_password,
+                    "date_created": date_created,
+                }
+                for index in range(start, start + size)
+            ],
+        )
+        await get_token_store().issue(
+            [
+                Jwt(
+                    id=UtilsService.create_uuid(),
+                    access_group=group.id,
+                    signature=f"seed.{index}.signature",
+                    valid_until=now + 86400,
+                    date_created=now,
+                    times_refreshed=0,
+                )
+                for index in range(start, start + size)
+            ]
+        )
+    return {"email": email, "password": PASSWORD, "access_group": group.id}
+
+
+async def build_scenario(
+    client, scenario: str, group: dict, requests: int
+) -> Callable[[int], Awaitable]:
+    """Build the request sender of a scenario.
+
+    Args:
+        client (AsyncClient): The client of the app.
+        scenario (str): The scenario name.
+        group (dict): The benchmark access group.
+        requests (int): The number of requests to be sent.
+
+    Returns:
+        Callable[[int], Awaitable]: Sends the request of an index.
+    """
+    from src.service.auth import AuthService
+
+    credentials = {"email": group["email"], "password": group["password"]}
+    if scenario == "issue":
+        return lambda index: client.post("/auth/", json=credentials)
+    if scenario == "verify":
+        tokens = await AuthService.create_jwts(
+            group["access_group"], min(requests, 1000)
+        )
+        return lambda index: client.put(
+            "/auth/",
+            json={
+                "access_group": str(group["access_group"]),
+                "signature": tokens[index % len(tokens)].signature,
+            },
+        )
+    if scenario == "signup":
+        run_id = time.time_ns()
+        return lambda index: client.post(
+            "/access-groups/",
+            json={
+                "name": f"Signup {index}",
+                "email": f"signup-{run_id}-{index}@example.com",
+                "password": PASSWORD,
+            },
+        )
+    return lambda index: client.get("/access-groups/", params={"limit": 100})
+
+
+async def run_case(
+    send: Callable[[int], Awaitable], concurrency: int, requests: int
+) -> dict:
+    """Send the requests of a case with a number of concurrent clients.
+
+    Args:
+        send (Callable[[int], Awaitable]): Sends the request of an index.
+        concurrency (int): The number of concurrent clients.
+        requests (int): The number of requests.
+
+    Returns:
+        dict: The summary of the case, with the number of errors.
+    """
+    indexes = count()
+    latencies = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        while (index := next(indexes)) < requests:
+            started = time.perf_counter()
+            response = await send(index)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    summary = summarize(
+        latencies,
+        time.perf_counter() - started,
+        time.process_time() - cpu_started,
+    )
+    return {**summary, "errors": errors}
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    """Run every case of the benchmark.
+
+    Args:
+        args (argparse.Namespace): The options.
+
+    Returns:
+        list[dict]: The result of each case.
+    """
+    from asgi_lifespan import LifespanManager
+    from httpx import ASGITransport, AsyncClient
+
+    from src.app.main import app
+
+    results = []
+    async with LifespanManager(app) as manager:
+        transport = ASGITransport(app=manager.app)
+        async with AsyncClient(transport=transport, base_url=BASE_URL) as client:
+            for table_size in args.table_sizes:
+                group = await seed(table_size, args.seed_chunk_size)
+                for scenario in args.scenarios:
+                    for concurrency in args.concurrency:
+                        send = await build_scenario(
+                            client, scenario, group, args.requests
+                        )
+                        result = {
+                            "scenario": scenario,
+                            "table_size": table_size,
+                            "concurrency": concurrency,
+                            **await run_case(send, concurrency, args.requests),
+                        }
+                        print(
+                            f"{scenario:>7} table={table_size:<8} "
+                            f"concurrency={concurrency:<4} "
+                            f"{result['throughput']:>9}/s "
+                            f"p50={result['p50_ms']}ms p99={result['p99_ms']}ms "
+                            f"cpu={result['cpu_ms']}ms "
+                            f"errors={result['errors']}"
+                        )
+                        results.append(result)
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks, write the results and compare them to the baseline.
+
+    Args:
+        argv (list[str] | None): The arguments, the process ones if None.
+
+    Returns:
+        int: The exit code, 1 if any case regressed.
+    """
+    args = parse_args(argv)
+    configure_environment(args.database)
+    results = asyncio.run(run(args))
+    meta = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "requests": args.requests,
+        "token_store": os.environ.get("TOKEN_STORE", "sql"),
+    }
+    write_results(args.output, results, meta)
+    if args.update_baseline:
+        write_results(args.baseline, results, meta)
+        return 0
+    if not args.baseline.exists():
+        return 0
+    regressions = compare(results, read_results(args.baseline), args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
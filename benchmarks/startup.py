@@ -0,0 +1,130 @@
+"""Measure the startup time of the service and check it against the budget.
+
+Each run starts a fresh interpreter, which times the import of the app, its
+lifespan startup and its first request. The median of the runs is compared to
+the budget tracked in benchmarks/startup_budget.json.
+
+Usage:
+    python -m benchmarks.startup --runs 5
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+from benchmarks.report import check_budget
+from benchmarks.run import configure_environment
+
+BUDGET_PATH = Path("benchmarks/startup_budget.json")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse the command line options.
+
+    Args:
+        argv (list[str] | None): The arguments, the process ones if None.
+
+    Returns:
+        argparse.Namespace: The options.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--database", type=Path, default=Path("benchmarks/data/startup.sql")
+    )
+    parser.add_argument("--budget", type=Path, default=BUDGET_PATH)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+async def measure() -> dict[str, float]:
+    """Start the app and send its first request, in the current interpreter.
+
+    Returns:
+        dict[str, float]: The import, lifespan and first request milliseconds,
+            each counted from the start of the import.
+    """
+    from asgi_lifespan import LifespanManager
+    from httpx import ASGITransport, AsyncClient
+
+    started = time.perf_counter()
+    from src.app.main import app
+
+    imported = time.perf_counter()
+    async with LifespanManager(app) as manager:
+        ready = time.perf_counter()
+        transport = ASGITransport(app=manager.app)
+        async with AsyncClient(
+            transport=transport, base_url="http://startup"
+        ) as client:
+            response = await client.get("/api/")
+            response.raise_for_status()
+        responded = time.perf_counter()
+    return {
+        "import_ms": round((imported - started) * 1000, 3),
+        "lifespan_ms": round((ready - started) * 1000, 3),
+        "first_request_ms": round((responded - started) * 1000, 3),
+    }
+
+
+def run(args: argparse.Namespace) -> dict[str, float]:
+    """Measure the startup in fresh interpreters, on an initialized database.
+
+    The schema is created once beforehand, as the migrate command does, and
+    the runs skip the implicit initialization unless set explicitly.
+
+    Args:
+        args (argparse.Namespace): The options.
+
+    Returns:
+        dict[str, float]: The median of each time.
+    """
+    configure_environment(args.database)
+    os.environ.setdefault("DB_INIT_ON_STARTUP", "false")
+    subprocess.run([sys.executable, "entrypoint.py", "migrate"], check=True)
+
+    runs = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.startup", "--child"],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        runs.append(json.loads(output.splitlines()[-1]))
+    return {name: statistics.median(run[name] for run in runs) for name in runs[0]}
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Measure the startup and check it against the budget.
+
+    Args:
+        argv (list[str] | None): The arguments, the process ones if None.
+
+    Returns:
+        int: The exit code, 1 if any time is over its budget.
+    """
+    args = parse_args(argv)
+    if args.child:
+        print(json.dumps(asyncio.run(measure())))
+        return 0
+
+    measured = run(args)
+    for name, value in measured.items():
+        print(f"{name:>16} {value}ms")
+    if not args.budget.exists():
+        return 0
+    overruns = check_budget(measured, json.loads(args.budget.read_text()))
+    for overrun in overruns:
+        print(f"OVER BUDGET {overrun}")
+    return 1 if overruns else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
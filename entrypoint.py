@@ -1,20 +1,96 @@
-"""Entrypoint for the service."""
+"""Entrypoint for the service.
 
+Usage:
+    python entrypoint.py            # Start the service
+    python entrypoint.py migrate    # Create and migrate the database schema
+"""
+
+import os
+import sys
+import asyncio
+import logging
+import argparse
 import uvicorn
 
-from src.app.settings import entry_settings
+from src.app.settings import entry_settings, store_settings
+from src.database.database import Database
+from src.database.migrations import Migrations
+from src.database.settings import database_settings
+
+logger = logging.getLogger(__name__)
+
+
+async def init_database() -> None:
+    """Create and migrate the database schema, before the workers start."""
+    await Migrations.upgrade()
+    await Database.engine.dispose()
+
+
+def get_workers() -> int:
+    """Get the number of worker processes to be started.
+
+    Returns:
+        int: The number of workers.
+    """
+    if entry_settings.APP_RELOAD:
+        return 1
+    if store_settings.TOKEN_STORE == "memory" and entry_settings.APP_WORKERS > 1:
+        logger.warning(
+            "The memory token store is not shared between processes, "
+            "starting a single worker."
+        )
+        return 1
+    return max(1, entry_settings.APP_WORKERS)
 
 
 def start_app():
-    """Starts the application."""
+    """Starts the application.
+
+    Unless DB_INIT_ON_STARTUP is disabled, the database schema is initialized
+    once, so the workers skip it on their startup. When it is disabled, the
+    schema must be created with the migrate command before deploying.
+    """
+    if database_settings.DB_INIT_ON_STARTUP:
+        asyncio.run(init_database())
+    # The workers read the environment, a single worker serves in-process
+    os.environ["DB_INIT_ON_STARTUP"] = "false"
+    database_settings.DB_INIT_ON_STARTUP = False
 
     uvicorn.run(
         app="src.app.main:app",
         host=entry_settings.APP_HOST,
         port=entry_settings.APP_PORT,
         reload=entry_settings.APP_RELOAD,
+        workers=get_workers(),
+        loop=entry_settings.APP_LOOP,
+        http=entry_settings.APP_HTTP,
+        backlog=entry_settings.APP_BACKLOG,
+        timeout_keep_alive=entry_settings.APP_TIMEOUT_KEEP_ALIVE,
+        timeout_graceful_shutdown=entry_settings.APP_TIMEOUT_GRACEFUL_SHUTDOWN,
     )
 
 
-if __name__ == "__main__":
+def main(argv: list[str] | None = None) -> int:
+    """Run a command of the service.
+
+    Args:
+        argv (list[str] | None): The arguments, the process ones if None.
+
+    Returns:
+        int: The exit code.
+    """
+    parser = argparse.ArgumentParser(description="JWT Auth Service.")
+    parser.add_argument(
+        "command", nargs="?", choices=("serve", "migrate"), default="serve"
+    )
+    args = parser.parse_args(argv)
+    if args.command == "migrate":
+        asyncio.run(init_database())
+        logger.info("The database schema is up to date.")
+        return 0
     start_app()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
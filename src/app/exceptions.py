@@ -9,9 +9,13 @@ class CustomBaseException(HTTPException):
     STATUS_CODE: int
     DETAIL: str
 
-    def __init__(self, **kwargs: dict[str, any]) -> None:
+    def __init__(
+        self, headers: dict[str, str] | None = None, **kwargs: dict[str, any]
+    ) -> None:
         """Constructor for the class."""
 
         super().__init__(
-            status_code=self.STATUS_CODE, detail=self.DETAIL.format(**kwargs)
+            status_code=self.STATUS_CODE,
+            detail=self.DETAIL.format(**kwargs),
+            headers=headers,
         )
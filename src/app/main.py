@@ -3,16 +3,42 @@
 from fastapi import FastAPI, status
 from contextlib import asynccontextmanager
 
-from src.database.database import Database
+from src.app.middleware import MetricsMiddleware
+from src.app.settings import (
+    metrics_settings,
+    profiling_settings,
+    reaper_settings,
+    refresh_settings,
+)
+from src.database.settings import database_settings
 from src.router.access_groups import access_groups_router
 from src.router.auth import auth_router
+from src.router.jwks import jwks_router
+from src.schema.passw import PasswordHandler
+from src.service.reaper import TokenReaper
+from src.service.keyring import Keyring
+from src.service.refresh_buffer import RefreshBuffer
+from src.store.factory import get_token_store
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context for the application."""
-    await Database.init_models()
+    Keyring.load()
+    if database_settings.DB_INIT_ON_STARTUP:
+        from src.database.migrations import Migrations
+
+        await Migrations.upgrade()
+    await get_token_store().start()
+    if refresh_settings.REFRESH_WRITE_BEHIND:
+        RefreshBuffer.start()
+    if reaper_settings.REAPER_ENABLED:
+        TokenReaper.start()
     yield
+    await TokenReaper.stop()
+    await RefreshBuffer.stop()
+    await get_token_store().stop()
+    PasswordHandler.shutdown()
 
 
 app = FastAPI(title="JWT Auth Service", version="0.0.1", lifespan=lifespan)
@@ -31,3 +57,16 @@ async def root() -> dict[str, str]:
 
 app.include_router(access_groups_router, prefix=prefix)
 app.include_router(auth_router, prefix=prefix)
+app.include_router(jwks_router)
+
+# The optional features are only imported when enabled, to speed up startup
+if metrics_settings.METRICS_ENABLED:
+    from src.router.metrics import metrics_router
+
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router)
+
+if profiling_settings.PROFILING_ENABLED:
+    from src.app.profiling import ProfilingMiddleware
+
+    app.add_middleware(ProfilingMiddleware)
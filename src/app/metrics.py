@@ -0,0 +1,263 @@
+"""Module for the application metrics, in the Prometheus text format."""
+
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    """Format the labels of a sample.
+
+    Args:
+        labels (dict[str, str]): The label values, by name.
+
+    Returns:
+        str: The labels between braces, empty if there are none.
+    """
+    if not labels:
+        return ""
+    escaped = (
+        str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        for value in labels.values()
+    )
+    pairs = ",".join(f'{name}="{value}"' for name, value in zip(labels.keys(), escaped))
+    return "{" + pairs + "}"
+
+
+@dataclass
+class MetricFamily:
+    """A metric collected when rendered, from the state kept by other objects."""
+
+    name: str
+    type: str
+    documentation: str
+    samples: list[tuple[dict[str, str], float]] = field(default_factory=list)
+
+    def render(self) -> list[str]:
+        """Render the metric.
+
+        Returns:
+            list[str]: The lines of the metric.
+        """
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        for labels, value in self.samples:
+            lines.append(f"{self.name}{format_labels(labels)} {value}")
+        return lines
+
+
+class Counter:
+    """A monotonically increasing value, per set of label values."""
+
+    def __init__(self, name: str, documentation: str, labels: tuple = ()) -> None:
+        """Constructor for the class.
+
+        Args:
+            name (str): The metric name.
+            documentation (str): The metric description.
+            labels (tuple): The label names.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increment the counter.
+
+        Args:
+            amount (float): The amount added.
+            **labels (str): The label values.
+        """
+        key = tuple(str(labels[name]) for name in self.labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def render(self) -> list[str]:
+        """Render the metric.
+
+        Returns:
+            list[str]: The lines of the metric.
+        """
+        return MetricFamily(
+            name=self.name,
+            type="counter",
+            documentation=self.documentation,
+            samples=[
+                (dict(zip(self.labels, key)), value)
+                for key, value in self.values.items()
+            ],
+        ).render()
+
+
+class Histogram:
+    """Observations counted in cumulative buckets, per set of label values."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Constructor for the class.
+
+        Args:
+            name (str): The metric name.
+            documentation (str): The metric description.
+            labels (tuple): The label names.
+            buckets (tuple[float, ...]): The sorted bucket upper bounds.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = buckets
+        self.values: dict[tuple, list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record an observation.
+
+        Args:
+            value (float): The observed value.
+            **labels (str): The label values.
+        """
+        key = tuple(str(labels[name]) for name in self.labels)
+        counts = self.values.get(key)
+        if counts is None:
+            counts = self.values[key] = [0] * (len(self.buckets) + 2)
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Record the seconds spent in a block, even if it raises.
+
+        Args:
+            **labels (str): The label values.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self) -> list[str]:
+        """Render the metric.
+
+        Returns:
+            list[str]: The lines of the metric.
+        """
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for key, counts in self.values.items():
+            labels = dict(zip(self.labels, key))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                bucket_labels = format_labels({**labels, "le": str(bound)})
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(labels)} {counts[-1]}")
+            lines.append(f"{self.name}_count{format_labels(labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """The metrics kept by the process, each worker exposes its own."""
+
+    def __init__(self) -> None:
+        """Constructor for the class."""
+        self.metrics: list[Counter | Histogram] = []
+
+    def counter(self, name: str, documentation: str, labels: tuple = ()) -> Counter:
+        """Create and register a counter.
+
+        Args:
+            name (str): The metric name.
+            documentation (str): The metric description.
+            labels (tuple): The label names.
+
+        Returns:
+            Counter: The counter.
+        """
+        counter = Counter(name, documentation, labels)
+        self.metrics.append(counter)
+        return counter
+
+    def histogram(self, name: str, documentation: str, labels: tuple = ()) -> Histogram:
+        """Create and register a histogram.
+
+        Args:
+            name (str): The metric name.
+            documentation (str): The metric description.
+            labels (tuple): The label names.
+
+        Returns:
+            Histogram: The histogram.
+        """
+        histogram = Histogram(name, documentation, labels)
+        self.metrics.append(histogram)
+        return histogram
+
+    def render(self, families: list[MetricFamily] | None = None) -> str:
+        """Render all the metrics in the Prometheus text format.
+
+        Args:
+            families (list[MetricFamily] | None): Extra collected metrics.
+
+        Returns:
+            str: The metrics exposition.
+        """
+        lines = []
+        for metric in [*self.metrics, *(families or [])]:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+http_request_duration = metrics.histogram(
+    "http_request_duration_seconds",
+    "Latency of the http requests.",
+    ("method", "route", "status"),
+)
+db_query_duration = metrics.histogram(
+    "db_query_duration_seconds",
+    "Latency of the database operations.",
+    ("operation",),
+)
+password_duration = metrics.histogram(
+    "password_duration_seconds",
+    "Latency of the password hashing jobs, including the pool queue.",
+    ("operation",),
+)
+jwt_duration = metrics.histogram(
+    "jwt_duration_seconds",
+    "Latency of signing and verifying the jwt tokens.",
+    ("operation",),
+)
+tokens_issued = metrics.counter("tokens_issued_total", "Jwt tokens issued.")
+tokens_verified = metrics.counter(
+    "tokens_verified_total", "Jwt tokens verified, by result.", ("result",)
+)
+tokens_revoked = metrics.counter("tokens_revoked_total", "Jwt tokens revoked.")
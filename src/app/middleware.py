@@ -0,0 +1,67 @@
+"""Module for the ASGI middlewares of the application."""
+
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.app.metrics import http_request_duration
+
+
+class MetricsMiddleware:
+    """Records the latency of every http request, by route and status."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Constructor for the class.
+
+        Args:
+            app (ASGIApp): The wrapped application.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle a request, timing it until the response is sent.
+
+        Args:
+            scope (Scope): The connection scope.
+            receive (Receive): The receive channel.
+            send (Send): The send channel.
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_request_duration.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=self.get_route(scope),
+                status=status_code,
+            )
+
+    @staticmethod
+    def get_route(scope: Scope) -> str:
+        """Get the route label of a request, keeping the label values bounded.
+
+        Args:
+            scope (Scope): The connection scope.
+
+        Returns:
+            str: The path of a static route, the template of a route with path
+                parameters or "unmatched".
+        """
+        route = scope.get("route")
+        if route is None:
+            return "unmatched"
+        if scope.get("path_params"):
+            return route.path
+        return scope["path"]
@@ -0,0 +1,190 @@
+"""Module for the request profiling middleware, only loaded when enabled."""
+
+import io
+import time
+import pstats
+import random
+import asyncio
+import cProfile
+from pathlib import Path
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.app.settings import profiling_settings
+
+
+class ProfilingMiddleware:
+    """Profiles the requests asked for or sampled, with cProfile.
+
+    Only one request is profiled at a time. The profiler records everything
+    that runs on the event loop meanwhile, including concurrent requests.
+    """
+
+    _active: bool = False
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Constructor for the class.
+
+        Args:
+            app (ASGIApp): The wrapped application.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle a request, profiling it if asked for or sampled.
+
+        Args:
+            scope (Scope): The connection scope.
+            receive (Receive): The receive channel.
+            send (Send): The send channel.
+        """
+        if scope["type"] != "http" or ProfilingMiddleware._active:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        requested = self.is_requested(headers)
+        sampled = (
+            profiling_settings.PROFILING_DIR is not None
+            and random.random() < profiling_settings.PROFILING_SAMPLE_RATE
+        )
+        if not requested and not sampled:
+            await self.app(scope, receive, send)
+            return
+
+        inline = requested and (
+            profiling_settings.PROFILING_DIR is None
+            or headers.get(f"{profiling_settings.PROFILING_HEADER}-Output") == "inline"
+        )
+        if inline:
+            await self.profile_inline(scope, receive, send)
+        else:
+            await self.profile_to_file(scope, receive, send)
+
+    @staticmethod
+    def is_requested(headers: Headers) -> bool:
+        """Check if a request asks to be profiled.
+
+        Args:
+            headers (Headers): The request headers.
+
+        Returns:
+            bool: True if the profiling header is present, with the token if
+                one is set.
+        """
+        value = headers.get(profiling_settings.PROFILING_HEADER)
+        if value is None:
+            return False
+        token = profiling_settings.PROFILING_TOKEN
+        return token is None or value == token
+
+    async def profile(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> tuple[str, cProfile.Profile]:
+        """Run the request under the profiler.
+
+        Args:
+            scope (Scope): The connection scope.
+            receive (Receive): The receive channel.
+            send (Send): The send channel.
+
+        Returns:
+            tuple[str, cProfile.Profile]: The report, with the wall and CPU
+                time and the slowest calls, and the profiler.
+        """
+        profiler = cProfile.Profile()
+        ProfilingMiddleware._active = True
+        wall_started = time.perf_counter()
+        cpu_started = time.process_time()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.disable()
+            ProfilingMiddleware._active = False
+        wall = time.perf_counter() - wall_started
+        cpu = time.process_time() - cpu_started
+
+        stream = io.StringIO()
+        stream.write(
+            f"{scope['method']} {scope['path']}\n"
+            f"wall time: {wall * 1000:.3f} ms, cpu time: {cpu * 1000:.3f} ms\n"
+        )
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE)
+        stats.print_stats(profiling_settings.PROFILING_TOP)
+        return stream.getvalue(), profiler
+
+    async def profile_inline(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Profile a request, responding with the report instead.
+
+        Args:
+            scope (Scope): The connection scope.
+            receive (Receive): The receive channel.
+            send (Send): The send channel.
+        """
+        status_code = 500
+
+        async def discard(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        report, _ = await self.profile(scope, receive, discard)
+        body = report.encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/plain; charset=utf-8"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"x-profile-status", str(status_code).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    async def profile_to_file(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Profile a request, writing the report and the raw stats to files.
+
+        The raw stats can be loaded with pstats or snakeviz for the call tree.
+
+        Args:
+            scope (Scope): The connection scope.
+            receive (Receive): The receive channel.
+            send (Send): The send channel.
+        """
+        name = "{}-{}-{}".format(
+            time.strftime("%Y%m%dT%H%M%S"),
+            scope["method"],
+            scope["path"].strip("/").replace("/", "_") or "root",
+        )
+        path = Path(profiling_settings.PROFILING_DIR) / f"{name}-{time.time_ns()}.prof"
+
+        async def send_with_path(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message = {
+                    **message,
+                    "headers": [
+                        *message.get("headers", []),
+                        (b"x-profile-path", str(path).encode()),
+                    ],
+                }
+            await send(message)
+
+        report, profiler = await self.profile(scope, receive, send_with_path)
+        await asyncio.to_thread(self.write_profile, path, report, profiler)
+
+    @staticmethod
+    def write_profile(path: Path, report: str, profiler: cProfile.Profile) -> None:
+        """Write a profile to the profiling directory.
+
+        Args:
+            path (Path): The raw stats path, the report is written next to it.
+            report (str): The text report.
+            profiler (cProfile.Profile): The profiler with the raw stats.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(path)
+        Path(f"{path}.txt").write_text(report)
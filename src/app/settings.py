@@ -1,5 +1,7 @@
 """Settings for the application."""
 
+import os
+from typing import Literal
 from pydantic_settings import BaseSettings
 
 
@@ -9,6 +11,13 @@ class EntryPointSettings(BaseSettings):
     APP_HOST: str = "0.0.0.0"
     APP_PORT: int = 5001
     APP_RELOAD: bool = False
+    APP_WORKERS: int = os.cpu_count() or 1
+    APP_LOOP: Literal["auto", "asyncio", "uvloop"] = "auto"
+    APP_HTTP: Literal["auto", "h11", "httptools"] = "auto"
+    APP_BACKLOG: int = 2048
+    APP_TIMEOUT_KEEP_ALIVE: int = 5
+    APP_TIMEOUT_GRACEFUL_SHUTDOWN: int | None = 30
+    APP_TIMEZONE: str = "America/Sao_Paulo"
 
 
 class JwtSettings(BaseSettings):
@@ -17,7 +26,121 @@ class JwtSettings(BaseSettings):
     JWT_KEY: str = "foo"
     JWT_ALGORITHM: str = "HS256"
     JWT_VALID_TIME: int = 120
+    JWT_MAX_REFRESH_TIME: int = 86400
+    JWT_BATCH_MAX_SIZE: int = 1000
+    JWT_PRIVATE_KEY_PATH: str | None = None
+    JWT_KEY_ID: str | None = None
+    JWT_RETIRING_KEY_PATHS: list[str] = []
+    JWT_JWKS_MAX_AGE: int = 300
+
+
+class PasswordSettings(BaseSettings):
+    """Settings for the password hashing cost and worker pool."""
+
+    PASSWORD_TIME_COST: int = 3
+    PASSWORD_MEMORY_COST: int = 65536
+    PASSWORD_PARALLELISM: int = 4
+    PASSWORD_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_WORKERS: int = min(4, os.cpu_count() or 1)
+    PASSWORD_QUEUE_SIZE: int = 64
+
+
+class CacheSettings(BaseSettings):
+    """Settings for the in-memory caches, a size of zero disables the cache."""
+
+    TOKEN_CACHE_SIZE: int = 10000
+    TOKEN_CACHE_TTL: int = 30
+    ACCESS_GROUP_CACHE_SIZE: int = 10000
+    ACCESS_GROUP_CACHE_TTL: int = 300
+    ACCESS_GROUP_NEGATIVE_TTL: int = 5
+
+
+class RefreshSettings(BaseSettings):
+    """Settings for the write-behind of token refreshes."""
+
+    REFRESH_WRITE_BEHIND: bool = False
+    REFRESH_FLUSH_INTERVAL: float = 1.0
+    REFRESH_FLUSH_SIZE: int = 500
+
+
+class ReaperSettings(BaseSettings):
+    """Settings for the background reaper of expired tokens."""
+
+    REAPER_ENABLED: bool = True
+    REAPER_INTERVAL: float = 60.0
+    REAPER_GRACE_PERIOD: int = 3600
+    REAPER_CHUNK_SIZE: int = 500
+    REAPER_CHUNK_PAUSE: float = 0.1
+
+
+class PaginationSettings(BaseSettings):
+    """Settings for the paginated listings."""
+
+    PAGE_DEFAULT_LIMIT: int = 100
+    PAGE_MAX_LIMIT: int = 1000
+
+
+class StoreSettings(BaseSettings):
+    """Settings for the token store backend."""
+
+    TOKEN_STORE: Literal["sql", "memory"] = "sql"
+    TOKEN_STORE_SHARDS: int = 16
+    TOKEN_STORE_SNAPSHOT_PATH: str | None = None
+    TOKEN_STORE_SNAPSHOT_INTERVAL: float = 60.0
+
+
+class LoginLimitSettings(BaseSettings):
+    """Settings for the login rate limits, as token buckets of attempts.
+
+    The refill rates are in attempts per second. Behind a reverse proxy, the
+    client address is read from the last entry of LOGIN_LIMIT_CLIENT_HEADER,
+    which must be set by the proxy itself.
+    """
+
+    LOGIN_LIMIT_ENABLED: bool = True
+    LOGIN_EMAIL_BURST: int = 10
+    LOGIN_EMAIL_REFILL: float = 0.2
+    LOGIN_CLIENT_BURST: int = 50
+    LOGIN_CLIENT_REFILL: float = 5.0
+    LOGIN_LIMIT_MAX_KEYS: int = 100000
+    LOGIN_LIMIT_CLIENT_HEADER: str | None = None
+
+
+class MetricsSettings(BaseSettings):
+    """Settings for the metrics endpoint.
+
+    When a token is set, the endpoint requires it as a bearer token.
+    """
+
+    METRICS_ENABLED: bool = False
+    METRICS_TOKEN: str | None = None
+
+
+class ProfilingSettings(BaseSettings):
+    """Settings for profiling single requests.
+
+    A request is profiled when it has the profiling header, holding the token
+    if one is set, or when it is sampled. The profiles are written to the
+    profiling directory, or returned in place of the response when asked
+    for or when there is no directory.
+    """
+
+    PROFILING_ENABLED: bool = False
+    PROFILING_HEADER: str = "X-Profile"
+    PROFILING_TOKEN: str | None = None
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_DIR: str | None = None
+    PROFILING_TOP: int = 50
 
 
 entry_settings = EntryPointSettings()
 jwt_settings = JwtSettings()
+password_settings = PasswordSettings()
+cache_settings = CacheSettings()
+refresh_settings = RefreshSettings()
+reaper_settings = ReaperSettings()
+pagination_settings = PaginationSettings()
+store_settings = StoreSettings()
+login_limit_settings = LoginLimitSettings()
+metrics_settings = MetricsSettings()
+profiling_settings = ProfilingSettings()
@@ -1,18 +1,203 @@
 """Module for database operations."""
 
-from sqlalchemy import MetaData
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import AsyncIterator
+from sqlalchemy import MetaData, event, make_url
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
 
-from src.database.settings import database_settings
+from src.app.metrics import db_query_duration
+from src.database.settings import DatabaseSettings, database_settings
 
 Base = declarative_base(metadata=MetaData())
 
 
+def build_engine(settings: DatabaseSettings) -> AsyncEngine:
+    """Create the database engine, with the pool and SQLite tuning applied.
+
+    Args:
+        settings (DatabaseSettings): The database settings.
+
+    Returns:
+        AsyncEngine: The database engine.
+    """
+    url = make_url(settings.CONN_URL)
+    is_sqlite = url.get_backend_name() == "sqlite"
+    options = {}
+    if not is_sqlite or url.database not in (None, "", ":memory:"):
+        options = {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        }
+    engine = create_async_engine(url, **options)
+
+    if is_sqlite:
+        pragmas = {
+            "journal_mode": settings.SQLITE_JOURNAL_MODE,
+            "synchronous": settings.SQLITE_SYNCHRONOUS,
+            "busy_timeout": settings.SQLITE_BUSY_TIMEOUT,
+            "cache_size": settings.SQLITE_CACHE_SIZE,
+            "mmap_size": settings.SQLITE_MMAP_SIZE,
+        }
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+            """Apply the SQLite pragmas on every new connection."""
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+    return engine
+
+
+@dataclass
+class UnitOfWork:
+    """The connection shared by the database operations of a request."""
+
+    read_only: bool
+    connection: AsyncConnection | None = None
+    written: bool = False
+    write_locked: bool = False
+
+
+class ReadOnlyTransactionError(RuntimeError):
+    """Raised when a write is attempted in a read-only unit of work."""
+
+
 class Database:
-    """The database class, used to perform operations."""
+    """The database class, used to perform operations.
+
+    Inside a unit of work, opened with Database.transaction, the operations
+    share one connection. Otherwise each one checks out its own.
+
+    SQLite allows one writer at a time, and a blocked writer polls the lock
+    with growing sleeps. The write transactions of the process are queued on
+    a lock instead, held until they commit.
+    """
+
+    engine = build_engine(database_settings)
+    serialize_writes: bool = engine.dialect.name == "sqlite"
+    _unit_of_work: ContextVar[UnitOfWork | None] = ContextVar(
+        "unit_of_work", default=None
+    )
+    _write_lock: tuple[asyncio.AbstractEventLoop, asyncio.Lock] | None = None
+
+    @classmethod
+    def get_write_lock(cls) -> asyncio.Lock:
+        """Get the lock of the write transactions, of the running event loop.
+
+        Returns:
+            asyncio.Lock: The lock.
+        """
+        loop = asyncio.get_running_loop()
+        if cls._write_lock is None or cls._write_lock[0] is not loop:
+            cls._write_lock = (loop, asyncio.Lock())
+        return cls._write_lock[1]
+
+    @classmethod
+    @asynccontextmanager
+    async def transaction(cls, read_only: bool = False) -> AsyncIterator[None]:
+        """Share one connection between the database operations of a block.
+
+        The connection is only checked out by the first operation, so a block
+        served from the caches does not take one. A read-write block runs in
+        one transaction, committed when it exits and rolled back if it
+        raises. A read-only block rejects writes and is never committed.
+        Nested blocks join the outer one.
+
+        Args:
+            read_only (bool): Whether the block only reads.
+
+        Raises:
+            ReadOnlyTransactionError: If a read-write block is nested in a
+                read-only one.
+        """
+        current = cls._unit_of_work.get()
+        if current is not None:
+            if current.read_only and not read_only:
+                raise ReadOnlyTransactionError()
+            yield
+            return
+
+        unit_of_work = UnitOfWork(read_only=read_only)
+        token = cls._unit_of_work.set(unit_of_work)
+        try:
+            yield
+            if unit_of_work.connection is not None and not read_only:
+                await unit_of_work.connection.commit()
+        finally:
+            cls._unit_of_work.reset(token)
+            try:
+                if unit_of_work.connection is not None:
+                    await unit_of_work.connection.close()
+            finally:
+                if unit_of_work.write_locked:
+                    cls.get_write_lock().release()
+
+    @classmethod
+    @asynccontextmanager
+    async def connect(cls, write: bool = False) -> AsyncIterator[AsyncConnection]:
+        """Get the connection of the current unit of work, or a new one.
+
+        Outside a unit of work, a write runs in its own transaction.
+
+        Args:
+            write (bool): Whether the operation writes.
 
-    engine = create_async_engine(database_settings.CONN_URL)
+        Yields:
+            AsyncConnection: The connection.
+
+        Raises:
+            ReadOnlyTransactionError: If a write is attempted in a read-only
+                unit of work.
+        """
+        unit_of_work = cls._unit_of_work.get()
+        if unit_of_work is None:
+            if write and cls.serialize_writes:
+                async with cls.get_write_lock(), cls.engine.begin() as conn:
+                    yield conn
+            elif write:
+                async with cls.engine.begin() as conn:
+                    yield conn
+            else:
+                async with cls.engine.connect() as conn:
+                    yield conn
+            return
+
+        if write and unit_of_work.read_only:
+            raise ReadOnlyTransactionError()
+        unit_of_work.written = unit_of_work.written or write
+        if write and cls.serialize_writes and not unit_of_work.write_locked:
+            await cls.get_write_lock().acquire()
+            unit_of_work.write_locked = True
+        if unit_of_work.connection is None:
+            unit_of_work.connection = await cls.engine.connect()
+        yield unit_of_work.connection
+
+    @classmethod
+    async def release(cls) -> None:
+        """Return the connection of the current unit of work to the pool.
+
+        Called before a slow step that needs no connection, the next operation
+        of the unit of work checks out a new one. Once the unit of work has
+        written, its connection is kept so the writes stay in one transaction.
+        """
+        unit_of_work = cls._unit_of_work.get()
+        if (
+            unit_of_work is None
+            or unit_of_work.connection is None
+            or unit_of_work.written
+        ):
+            return
+        await unit_of_work.connection.close()
+        unit_of_work.connection = None
 
     @classmethod
     async def fetch_one(cls, query) -> dict | None:
@@ -24,10 +209,11 @@ class Database:
         Returns:
             dict | None: Dict if is any row, None otherwise.
         """
-        async with cls.engine.connect() as conn:
-            cursor = await conn.execute(query)
-            row = cursor.fetchone()
-            return (row._mapping) if row else None
+        with db_query_duration.time(operation="fetch_one"):
+            async with cls.connect() as conn:
+                cursor = await conn.execute(query)
+                row = cursor.fetchone()
+                return (row._mapping) if row else None
 
     @classmethod
     async def fetch_all(cls, query) -> list[dict]:
@@ -39,20 +225,74 @@ class Database:
         Returns:
             list[dict]: Rows fetched.
         """
-        async with cls.engine.connect() as conn:
-            cursor = await conn.execute(query)
-            rows = cursor.fetchall()
-            return [(row._mapping) for row in rows]
+        with db_query_duration.time(operation="fetch_all"):
+            async with cls.connect() as conn:
+                cursor = await conn.execute(query)
+                rows = cursor.fetchall()
+                return [(row._mapping) for row in rows]
 
     @classmethod
-    async def execute(cls, query) -> None:
+    async def stream(cls, query, chunk_size: int = 500) -> AsyncIterator[dict]:
+        """Stream rows from the database through a server-side cursor.
+
+        The rows are read on a connection of its own, since they are usually
+        consumed after the unit of work of the request is closed.
+
+        Args:
+            query (): The query to be executed.
+            chunk_size (int): The number of rows buffered at a time.
+
+        Yields:
+            dict: Each row fetched.
+        """
+        with db_query_duration.time(operation="stream"):
+            async with cls.engine.connect() as conn:
+                result = await conn.stream(
+                    query.execution_options(yield_per=chunk_size)
+                )
+                async for row in result:
+                    yield row._mapping
+
+    @classmethod
+    async def execute(cls, query) -> int:
         """Execute a query.
 
         Args:
             query (): The query to be executed.
+
+        Returns:
+            int: The number of rows affected.
         """
-        async with cls.engine.begin() as conn:
-            await conn.execute(query)
+        with db_query_duration.time(operation="execute"):
+            async with cls.connect(write=True) as conn:
+                cursor = await conn.execute(query)
+                return cursor.rowcount
+
+    @classmethod
+    async def update_returning(cls, query, fallback_query) -> dict | None:
+        """Update one row and fetch it, in one transaction.
+
+        The row is returned by the update itself where the backend supports
+        RETURNING, otherwise it is selected by the fallback query after it.
+
+        Args:
+            query (): The update of one row, without RETURNING.
+            fallback_query (): The query selecting the updated row.
+
+        Returns:
+            dict | None: The updated row, None if no row was updated.
+        """
+        with db_query_duration.time(operation="update_returning"):
+            async with cls.connect(write=True) as conn:
+                if conn.dialect.update_returning:
+                    cursor = await conn.execute(query.returning(*query.table.c))
+                else:
+                    cursor = await conn.execute(query)
+                    if cursor.rowcount == 0:
+                        return None
+                    cursor = await conn.execute(fallback_query)
+                row = cursor.fetchone()
+                return (row._mapping) if row else None
 
     @classmethod
     async def execute_many(cls, queries: list) -> None:
@@ -61,9 +301,24 @@ class Database:
         Args:
             queries (): The queries to be executed.
         """
-        async with cls.engine.begin() as conn:
-            for query in queries:
-                await conn.execute(query)
+        with db_query_duration.time(operation="execute_many"):
+            async with cls.connect(write=True) as conn:
+                for query in queries:
+                    await conn.execute(query)
+
+    @classmethod
+    async def execute_batch(cls, query, params: list[dict]) -> None:
+        """Execute a query once per parameter set, batched in one transaction.
+
+        Args:
+            query (): The query to be executed.
+            params (list[dict]): The parameters of each execution.
+        """
+        if not params:
+            return
+        with db_query_duration.time(operation="execute_batch"):
+            async with cls.connect(write=True) as conn:
+                await conn.execute(query, params)
 
     @classmethod
     async def init_models(cls) -> None:
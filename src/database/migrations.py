@@ -0,0 +1,138 @@
+"""Module for migrating existing databases to the current schema."""
+
+from sqlalchemy import (
+    Column,
+    Connection,
+    DateTime,
+    Integer,
+    MetaData,
+    Table,
+    inspect,
+    select,
+    text,
+)
+
+from src.database.database import Base, Database
+from src.database.tables import jwts_table
+from src.service.utils import UtilsService
+
+
+class Migrations:
+    """Schema migrations applied on top of the tables created by the models."""
+
+    BACKFILL_CHUNK_SIZE = 1000
+    TOKEN_TIME_COLUMNS = ("valid_until", "date_created", "last_refresh")
+
+    @classmethod
+    async def upgrade(cls) -> None:
+        """Create the missing tables and apply the pending migrations."""
+        await Database.init_models()
+        await cls.run()
+
+    @classmethod
+    async def run(cls) -> None:
+        """Apply the pending migrations."""
+        async with Database.engine.begin() as conn:
+            await conn.run_sync(cls.drop_signature_digest)
+            await conn.run_sync(cls.convert_token_times)
+            await conn.run_sync(cls.create_missing_indexes)
+
+    @classmethod
+    def drop_signature_digest(cls, conn: Connection) -> None:
+        """Drop the signature digest column of the jwts table and its indexes.
+
+        The tokens are looked up by their jti, the primary key, so the digest
+        was only a cost on every insert.
+
+        Args:
+            conn (Connection): The connection used to run the migration.
+        """
+        inspector = inspect(conn)
+        if not inspector.has_table(jwts_table.name):
+            return
+        columns = [column["name"] for column in inspector.get_columns(jwts_table.name)]
+        if "signature_digest" not in columns:
+            return
+        for index in inspector.get_indexes(jwts_table.name):
+            if "signature_digest" in index["column_names"]:
+                conn.execute(text(f"DROP INDEX {index['name']}"))
+        conn.execute(
+            text(f"ALTER TABLE {jwts_table.name} DROP COLUMN signature_digest")
+        )
+
+    @classmethod
+    def convert_token_times(cls, conn: Connection) -> None:
+        """Convert the times of the jwts table from datetimes to epoch seconds.
+
+        The table is rebuilt: the legacy one is renamed, the current one is
+        created and the rows are copied in chunks, converting the naive
+        datetimes from the America/Sao_Paulo wall time they were stored in.
+
+        Args:
+            conn (Connection): The connection used to run the migration.
+        """
+        inspector = inspect(conn)
+        if not inspector.has_table(jwts_table.name):
+            return
+        columns = {
+            column["name"]: column["type"]
+            for column in inspector.get_columns(jwts_table.name)
+        }
+        if isinstance(columns["valid_until"], Integer):
+            return
+
+        legacy_name = f"{jwts_table.name}_legacy"
+        for index in inspector.get_indexes(jwts_table.name):
+            conn.execute(text(f"DROP INDEX {index['name']}"))
+        conn.execute(text(f"ALTER TABLE {jwts_table.name} RENAME TO {legacy_name}"))
+        jwts_table.create(conn)
+
+        legacy_table = Table(
+            legacy_name,
+            MetaData(),
+            *(
+                Column(
+                    column.name,
+                    DateTime if column.name in cls.TOKEN_TIME_COLUMNS else column.type,
+                    primary_key=column.primary_key,
+                )
+                for column in jwts_table.c
+            ),
+        )
+        query_chunk = (
+            select(legacy_table)
+            .order_by(legacy_table.c.id)
+            .limit(cls.BACKFILL_CHUNK_SIZE)
+        )
+        query = query_chunk
+        while rows := conn.execute(query).mappings().fetchall():
+            conn.execute(
+                jwts_table.insert(),
+                [
+                    {
+                        **row,
+                        **{
+                            name: UtilsService.get_int_timestamp_from_legacy(row[name])
+                            for name in cls.TOKEN_TIME_COLUMNS
+                            if row[name] is not None
+                        },
+                    }
+                    for row in rows
+                ],
+            )
+            query = query_chunk.where(legacy_table.c.id > rows[-1]["id"])
+        legacy_table.drop(conn)
+
+    @classmethod
+    def create_missing_indexes(cls, conn: Connection) -> None:
+        """Create the indexes added to tables that already exist.
+
+        Args:
+            conn (Connection): The connection used to run the migration.
+        """
+        inspector = inspect(conn)
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
@@ -1,12 +1,57 @@
 """Settings for the database."""
 
+from typing import Literal
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
 
 class DatabaseSettings(BaseSettings):
-    """Class for the database settings."""
+    """Class for the database settings.
+
+    The "high-throughput" profile raises the pool and SQLite cache limits for
+    production, settings given explicitly still take precedence over it.
+    """
 
     CONN_URL: str = "sqlite+aiosqlite:///src/database/data/db.sql"
+    DB_INIT_ON_STARTUP: bool = True
+    DB_PROFILE: Literal["default", "high-throughput"] = "default"
+
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = False
+
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT: int = 5000
+    SQLITE_CACHE_SIZE: int = -16000
+    SQLITE_MMAP_SIZE: int = 0
+
+    @model_validator(mode="after")
+    def apply_profile(self) -> "DatabaseSettings":
+        """Apply the profile values to the settings not given explicitly.
+
+        Returns:
+            DatabaseSettings: The settings with the profile applied.
+        """
+        for name, value in DATABASE_PROFILES[self.DB_PROFILE].items():
+            if name not in self.model_fields_set:
+                setattr(self, name, value)
+        return self
+
 
+DATABASE_PROFILES: dict[str, dict[str, int | float | bool | str]] = {
+    "default": {},
+    "high-throughput": {
+        "DB_POOL_SIZE": 20,
+        "DB_MAX_OVERFLOW": 40,
+        "DB_POOL_TIMEOUT": 10.0,
+        "DB_POOL_RECYCLE": 3600,
+        "SQLITE_BUSY_TIMEOUT": 10000,
+        "SQLITE_CACHE_SIZE": -64000,
+        "SQLITE_MMAP_SIZE": 268435456,
+    },
+}
 
 database_settings = DatabaseSettings()
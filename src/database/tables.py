@@ -1,7 +1,17 @@
 """Module for defining the database tables."""
 
 from sqlalchemy.orm import relationship
-from sqlalchemy import Column, ForeignKey, String, Integer, DateTime, UUID, Text
+from sqlalchemy import (
+    Column,
+    ForeignKey,
+    String,
+    Integer,
+    BigInteger,
+    DateTime,
+    UUID,
+    Text,
+    Index,
+)
 
 from src.database.database import Base
 
@@ -10,6 +20,7 @@ class AccessGroups(Base):
     """The acess groups table structure."""
 
     __tablename__ = "access_groups"
+    __table_args__ = (Index("ix_access_groups_date_created_id", "date_created", "id"),)
 
     id = Column(UUID(as_uuid=True), primary_key=True)
     name = Column(String(50), nullable=False)
@@ -28,9 +39,9 @@ class Jwts(Base):
         UUID(as_uuid=True), ForeignKey("access_groups.id"), nullable=False
     )
     signature = Column(Text, nullable=False)
-    valid_until = Column(DateTime, nullable=False)
-    date_created = Column(DateTime, nullable=False)
-    last_refresh = Column(DateTime, nullable=True)
+    valid_until = Column(BigInteger, nullable=False, index=True)
+    date_created = Column(BigInteger, nullable=False)
+    last_refresh = Column(BigInteger, nullable=True)
     times_refreshed = Column(Integer, nullable=False, default=0)
 
     access_group_rel = relationship("access_groups", foreign_keys="access_group")
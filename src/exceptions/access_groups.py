@@ -31,3 +31,10 @@ class AccessGroupIdUUIDException(CustomBaseException):
 
     STATUS_CODE = status.HTTP_400_BAD_REQUEST
     DETAIL = "The access group id must be a valid UUID, check it and try again."
+
+
+class InvalidCursorException(CustomBaseException):
+    """Exception raised when the pagination cursor is invalid."""
+
+    STATUS_CODE = status.HTTP_400_BAD_REQUEST
+    DETAIL = "The pagination cursor is invalid, check it and try again."
@@ -13,3 +13,8 @@ class ExpiredTokenException(CustomBaseException):
 class InvalidTokenException(CustomBaseException):
     STATUS_CODE = status.HTTP_400_BAD_REQUEST
     DETAIL = "The token provided is invalid."
+
+
+class TooManyLoginAttemptsException(CustomBaseException):
+    STATUS_CODE = status.HTTP_429_TOO_MANY_REQUESTS
+    DETAIL = "Too many login attempts, try again in {retry_after} seconds."
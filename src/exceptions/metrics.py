@@ -0,0 +1,10 @@
+"""Exceptions for metrics."""
+
+from fastapi import status
+
+from src.app.exceptions import CustomBaseException
+
+
+class MetricsUnauthorizedException(CustomBaseException):
+    STATUS_CODE = status.HTTP_401_UNAUTHORIZED
+    DETAIL = "A valid metrics token is required."
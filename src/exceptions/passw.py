@@ -0,0 +1,12 @@
+"""Exceptions for password handling."""
+
+from fastapi import status
+
+from src.app.exceptions import CustomBaseException
+
+
+class PasswordQueueFullException(CustomBaseException):
+    """Exception raised when the password hashing queue is full."""
+
+    STATUS_CODE = status.HTTP_503_SERVICE_UNAVAILABLE
+    DETAIL = "The service is busy processing credentials, try again later."
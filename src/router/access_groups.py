@@ -1,7 +1,11 @@
 """Endpoints for the access groups."""
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Query, Response, status
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator
 
+from src.app.settings import pagination_settings
+from src.database.database import Database
 from src.schema.access_groups import AccessGroupRequest, AccessGroupResponse
 from src.service.access_groups import AccessGroupsService
 
@@ -22,13 +26,38 @@ async def create_group_access(request: AccessGroupRequest) -> AccessGroupRespons
 
 
 @access_groups_router.get("/", status_code=status.HTTP_200_OK)
-async def get_all() -> list[AccessGroupResponse]:
-    """Get all access groups.
+async def get_all(
+    response: Response,
+    limit: int = Query(
+        default=pagination_settings.PAGE_DEFAULT_LIMIT,
+        ge=1,
+        le=pagination_settings.PAGE_MAX_LIMIT,
+    ),
+    cursor: str | None = None,
+    stream: bool = False,
+) -> list[AccessGroupResponse]:
+    """Get the access groups, a page at a time.
+
+    The cursor of the next page is returned in the X-Next-Cursor header. In
+    stream mode, all the groups after the cursor are returned as NDJSON.
+
+    Args:
+        response (Response): The response, to set the next cursor header.
+        limit (int): The maximum number of access groups in the page.
+        cursor (str | None): The cursor returned by the previous page.
+        stream (bool): Whether to stream all the groups as NDJSON.
 
     Returns:
         list[AccessGroupResponse]: The access groups retrieved.
     """
-    return await AccessGroupsService.get_all()
+    if stream:
+        groups = AccessGroupsService.stream_all(cursor)
+        return StreamingResponse(_to_ndjson(groups), media_type="application/x-ndjson")
+    async with Database.transaction(read_only=True):
+        groups, next_cursor = await AccessGroupsService.get_all(limit, cursor)
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return groups
 
 
 @access_groups_router.get("/by-id", status_code=status.HTTP_200_OK)
@@ -41,4 +70,18 @@ async def get_by_id(id: str) -> AccessGroupResponse:
     Returns:
         AccessGroupResponse: The access group data.
     """
-    return await AccessGroupsService.get_by_id(id)
+    async with Database.transaction(read_only=True):
+        return await AccessGroupsService.get_by_id(id)
+
+
+async def _to_ndjson(groups: AsyncIterator[AccessGroupResponse]) -> AsyncIterator[str]:
+    """Serialize the streamed access groups as NDJSON lines.
+
+    Args:
+        groups (AsyncIterator[AccessGroupResponse]): The access groups.
+
+    Yields:
+        str: Each access group as a JSON line.
+    """
+    async for group in groups:
+        yield group.model_dump_json() + "\n"
@@ -1,28 +1,82 @@
 """Endpoints for authentication."""
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Request, status
 
-from src.schema.auth import JwtRequest, JwtResponse, VerifyJwtRequest
+from src.app.settings import login_limit_settings
+from src.database.database import Database
+from src.schema.auth import (
+    JwtBatchRequest,
+    JwtRequest,
+    JwtResponse,
+    VerifyJwtBatchRequest,
+    VerifyJwtRequest,
+    VerifyJwtResult,
+)
 from src.service.access_groups import AccessGroupsService
 from src.service.auth import AuthService
+from src.service.rate_limit import LoginRateLimiter
 
 auth_router = APIRouter(prefix="/auth")
 
 
+def get_client_address(http_request: Request) -> str | None:
+    """Get the address of the client of a request.
+
+    With LOGIN_LIMIT_CLIENT_HEADER set, the last address of that header is
+    used, as appended by the trusted proxy in front of the service.
+
+    Args:
+        http_request (Request): The http request.
+
+    Returns:
+        str | None: The client host, None if unknown.
+    """
+    header = login_limit_settings.LOGIN_LIMIT_CLIENT_HEADER
+    if header and (forwarded := http_request.headers.get(header)):
+        return forwarded.split(",")[-1].strip()
+    return http_request.client.host if http_request.client else None
+
+
 @auth_router.post("/", status_code=status.HTTP_201_CREATED)
-async def create_jwt(request: JwtRequest) -> JwtResponse:
+async def create_jwt(request: JwtRequest, http_request: Request) -> JwtResponse:
     """Creates a new jwt token.
 
     Args:
         request (JwtRequest): The user payload.
+        http_request (Request): The http request, for the client address.
 
     Returns:
         JwtResponse: The jwt token.
     """
-    group_id = await AccessGroupsService.authenticate_group(
-        request.email, request.password
-    )
-    return await AuthService.create_jwt(request, group_id)
+    LoginRateLimiter.check(request.email, get_client_address(http_request))
+    async with Database.transaction():
+        group_id = await AccessGroupsService.authenticate_group(
+            request.email, request.password
+        )
+        LoginRateLimiter.refund(request.email)
+        return await AuthService.create_jwt(group_id)
+
+
+@auth_router.post("/batch", status_code=status.HTTP_201_CREATED)
+async def create_jwts(
+    request: JwtBatchRequest, http_request: Request
+) -> list[JwtResponse]:
+    """Creates many jwt tokens, authenticating the group once.
+
+    Args:
+        request (JwtBatchRequest): The user payload and number of tokens.
+        http_request (Request): The http request, for the client address.
+
+    Returns:
+        list[JwtResponse]: The jwt tokens.
+    """
+    LoginRateLimiter.check(request.email, get_client_address(http_request))
+    async with Database.transaction():
+        group_id = await AccessGroupsService.authenticate_group(
+            request.email, request.password
+        )
+        LoginRateLimiter.refund(request.email)
+        return await AuthService.create_jwts(group_id, request.count)
 
 
 @auth_router.put("/", status_code=status.HTTP_200_OK)
@@ -35,4 +89,30 @@ async def use_jwt(request: VerifyJwtRequest) -> JwtResponse:
     Returns:
         JwtResponse: The jwt token.
     """
-    return await AuthService.use_token(request)
+    async with Database.transaction():
+        return await AuthService.use_token(request)
+
+
+@auth_router.put("/batch", status_code=status.HTTP_200_OK)
+async def use_jwts(request: VerifyJwtBatchRequest) -> list[VerifyJwtResult]:
+    """Verify many jwt tokens at once.
+
+    Args:
+        request (VerifyJwtBatchRequest): The tokens to be verified.
+
+    Returns:
+        list[VerifyJwtResult]: The result of each token, in the same order.
+    """
+    async with Database.transaction():
+        return await AuthService.use_tokens(request.tokens)
+
+
+@auth_router.post("/revoke", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_jwt(request: VerifyJwtRequest) -> None:
+    """Revoke a jwt token.
+
+    Args:
+        request (VerifyJwtRequest): The request data.
+    """
+    async with Database.transaction():
+        await AuthService.revoke_token(request)
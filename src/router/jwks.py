@@ -0,0 +1,29 @@
+"""Endpoints for the public signing keys."""
+
+from fastapi import APIRouter, Request, Response, status
+
+from src.app.settings import jwt_settings
+from src.service.keyring import Keyring
+
+jwks_router = APIRouter(prefix="/.well-known")
+
+
+@jwks_router.get("/jwks.json", status_code=status.HTTP_200_OK)
+async def get_jwks(request: Request) -> Response:
+    """Get the public keys that verify the jwt tokens, as a JWK set.
+
+    Args:
+        request (Request): The request, to check the cached version.
+
+    Returns:
+        Response: The JWK set, or not modified if the client copy is current.
+    """
+    headers = {
+        "Cache-Control": f"public, max-age={jwt_settings.JWT_JWKS_MAX_AGE}",
+        "ETag": Keyring.jwks_etag,
+    }
+    if request.headers.get("If-None-Match") == Keyring.jwks_etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(
+        content=Keyring.jwks, media_type="application/json", headers=headers
+    )
@@ -0,0 +1,183 @@
+"""Endpoints for the application metrics."""
+
+from secrets import compare_digest
+from fastapi import APIRouter, Request, Response, status
+
+from src.app.metrics import MetricFamily, metrics
+from src.app.settings import metrics_settings
+from src.database.database import Database
+from src.exceptions.metrics import MetricsUnauthorizedException
+from src.schema.passw import PasswordHandler
+from src.service.access_groups import AccessGroupsService
+from src.service.auth import AuthService
+from src.service.cache import TTLCache
+from src.service.rate_limit import LoginRateLimiter
+from src.service.reaper import TokenReaper
+from src.service.refresh_buffer import RefreshBuffer
+
+metrics_router = APIRouter()
+
+
+def collect_cache_stats(
+    name: str, description: str, cache: TTLCache
+) -> list[MetricFamily]:
+    """Collect the metrics of a cache.
+
+    Args:
+        name (str): The metric names prefix.
+        description (str): The cache description, capitalized.
+        cache (TTLCache): The cache.
+
+    Returns:
+        list[MetricFamily]: The lookups, evictions and size of the cache.
+    """
+    stats = cache.stats
+    return [
+        MetricFamily(
+            f"{name}_requests_total",
+            "counter",
+            f"{description} lookups, by result.",
+            [({"result": "hit"}, stats["hits"]), ({"result": "miss"}, stats["misses"])],
+        ),
+        MetricFamily(
+            f"{name}_evictions_total",
+            "counter",
+            f"{description} entries evicted.",
+            [({}, stats["evictions"])],
+        ),
+        MetricFamily(
+            f"{name}_size", "gauge", f"{description} entries.", [({}, stats["size"])]
+        ),
+    ]
+
+
+def collect_stats() -> list[MetricFamily]:
+    """Collect the metrics kept by the services and the connection pool.
+
+    Returns:
+        list[MetricFamily]: The collected metrics.
+    """
+    families = [
+        *collect_cache_stats("token_cache", "Token cache", AuthService.token_cache),
+        *collect_cache_stats(
+            "access_group_cache",
+            "Access group cache",
+            AccessGroupsService.group_cache,
+        ),
+    ]
+
+    limiter = LoginRateLimiter.get_stats()
+    families.append(
+        MetricFamily(
+            "login_attempts_total",
+            "counter",
+            "Login attempts checked by the rate limiter, by key and result.",
+            [
+                ({"key": key, "result": result}, stats[result])
+                for key, stats in limiter.items()
+                for result in ("allowed", "rejected")
+            ],
+        )
+    )
+
+    password = PasswordHandler.get_stats()
+    families.append(
+        MetricFamily(
+            "password_jobs_in_flight",
+            "gauge",
+            "Password hashing jobs running or waiting in the pool.",
+            [({}, password["in_flight"])],
+        )
+    )
+
+    reaper = TokenReaper.get_stats()
+    buffer = RefreshBuffer.get_stats()
+    families.extend(
+        [
+            MetricFamily(
+                "reaper_runs_total", "counter", "Reaper runs.", [({}, reaper["runs"])]
+            ),
+            MetricFamily(
+                "reaper_rows_total",
+                "counter",
+                "Expired tokens deleted by the reaper.",
+                [({}, reaper["rows_reaped"])],
+            ),
+            MetricFamily(
+                "reaper_seconds_total",
+                "counter",
+                "Seconds spent reaping.",
+                [({}, reaper["seconds_spent"])],
+            ),
+            MetricFamily(
+                "refresh_buffer_flushes_total",
+                "counter",
+                "Flushes of the write-behind refresh buffer.",
+                [({}, buffer["flushes"])],
+            ),
+            MetricFamily(
+                "refresh_buffer_pending",
+                "gauge",
+                "Token refreshes waiting to be written.",
+                [({}, buffer["pending"])],
+            ),
+        ]
+    )
+
+    pool = Database.engine.pool
+    if hasattr(pool, "checkedout"):
+        families.append(
+            MetricFamily(
+                "db_pool_connections",
+                "gauge",
+                "Database pool connections, by state.",
+                [
+                    ({"state": "checked_out"}, pool.checkedout()),
+                    ({"state": "idle"}, pool.checkedin()),
+                    ({"state": "overflow"}, max(pool.overflow(), 0)),
+                ],
+            )
+        )
+        families.append(
+            MetricFamily(
+                "db_pool_size",
+                "gauge",
+                "Database pool size.",
+                [({}, pool.size())],
+            )
+        )
+    return families
+
+
+def check_metrics_token(http_request: Request) -> None:
+    """Check the bearer token of a metrics request, if one is set.
+
+    Args:
+        http_request (Request): The http request.
+
+    Raises:
+        MetricsUnauthorizedException: Raised when the token is missing or wrong.
+    """
+    token = metrics_settings.METRICS_TOKEN
+    if token is None:
+        return
+    authorization = http_request.headers.get("Authorization", "")
+    if not compare_digest(authorization.encode(), f"Bearer {token}".encode()):
+        raise MetricsUnauthorizedException(headers={"WWW-Authenticate": "Bearer"})
+
+
+@metrics_router.get("/metrics", status_code=status.HTTP_200_OK)
+async def get_metrics(http_request: Request) -> Response:
+    """Get the metrics of this worker, in the Prometheus text format.
+
+    Args:
+        http_request (Request): The http request, for the metrics token.
+
+    Returns:
+        Response: The metrics exposition.
+    """
+    check_metrics_token(http_request)
+    return Response(
+        content=metrics.render(collect_stats()),
+        media_type="text/plain; version=0.0.4",
+    )
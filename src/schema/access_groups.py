@@ -2,9 +2,7 @@
 
 from uuid import UUID
 from datetime import datetime
-from pydantic import BaseModel, EmailStr, field_validator
-
-from src.schema.passw import PasswordHandler
+from pydantic import BaseModel, EmailStr
 
 
 class AccessGroupRequest(BaseModel):
@@ -14,18 +12,6 @@ class AccessGroupRequest(BaseModel):
     email: EmailStr
     password: str
 
-    @field_validator("password", mode="before")
-    def hash_password(cls, value: str) -> str:
-        """Hash the password before validation.
-
-        Args:
-            value (str): The password to hash.
-
-        Returns:
-            str: The hashed password.
-        """
-        return PasswordHandler.hash_password(value)
-
 
 class AccessGroupResponse(BaseModel):
     """Schema to return a access group."""
@@ -2,20 +2,21 @@
 
 from uuid import UUID
 from datetime import datetime
-from pydantic import BaseModel, EmailStr, field_validator
+from pydantic import BaseModel, EmailStr, Field, field_validator
 
+from src.app.settings import jwt_settings
 from src.exceptions.access_groups import AccessGroupIdUUIDException
 
 
 class Jwt(BaseModel):
-    """Schema for the Jwt Token."""
+    """Schema for the Jwt Token, with its times in UTC epoch seconds."""
 
     id: UUID
     access_group: UUID
     signature: str
-    valid_until: datetime
-    date_created: datetime
-    last_refresh: datetime | None = None
+    valid_until: int
+    date_created: int
+    last_refresh: int | None = None
     times_refreshed: int
 
 
@@ -26,6 +27,12 @@ class JwtRequest(BaseModel):
     password: str
 
 
+class JwtBatchRequest(JwtRequest):
+    """Schema for a batch of new jwt tokens."""
+
+    count: int = Field(ge=1, le=jwt_settings.JWT_BATCH_MAX_SIZE)
+
+
 class JwtResponse(BaseModel):
     """Schema for a created jwt."""
 
@@ -60,3 +67,19 @@ class VerifyJwtRequest(BaseModel):
         except ValueError:
             raise AccessGroupIdUUIDException()
         return UUID(value)
+
+
+class VerifyJwtBatchRequest(BaseModel):
+    """Schema for a batch of jwt verifications."""
+
+    tokens: list[VerifyJwtRequest] = Field(
+        min_length=1, max_length=jwt_settings.JWT_BATCH_MAX_SIZE
+    )
+
+
+class VerifyJwtResult(BaseModel):
+    """Schema for the result of one jwt verification in a batch."""
+
+    valid: bool
+    token: JwtResponse | None = None
+    detail: str | None = None
@@ -1,12 +1,48 @@
 """Module for password handling utilities."""
 
-from pwdlib import PasswordHash
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from src.app.metrics import password_duration
+from src.app.settings import password_settings
+from src.exceptions.passw import PasswordQueueFullException
+
+if TYPE_CHECKING:
+    from pwdlib import PasswordHash
 
 
 class PasswordHandler:
     """Utility class for handling password hashing and verification."""
 
-    password_hasher = PasswordHash.recommended()
+    password_hasher: "PasswordHash | None" = None
+    _executor: Executor | None = None
+    _in_flight: int = 0
+
+    @classmethod
+    def get_hasher(cls) -> "PasswordHash":
+        """Get the password hasher, creating it on first use.
+
+        Argon2 is only loaded when a password is hashed or verified, in the
+        process that does it.
+
+        Returns:
+            PasswordHash: The hasher of the current parameters.
+        """
+        if cls.password_hasher is None:
+            from pwdlib import PasswordHash
+            from pwdlib.hashers.argon2 import Argon2Hasher
+
+            cls.password_hasher = PasswordHash(
+                (
+                    Argon2Hasher(
+                        time_cost=password_settings.PASSWORD_TIME_COST,
+                        memory_cost=password_settings.PASSWORD_MEMORY_COST,
+                        parallelism=password_settings.PASSWORD_PARALLELISM,
+                    ),
+                )
+            )
+        return cls.password_hasher
 
     @classmethod
     def hash_password(cls, password: str) -> str:
@@ -18,7 +54,7 @@ class PasswordHandler:
         Returns:
             str: The hashed password.
         """
-        return cls.password_hasher.hash(password)
+        return cls.get_hasher().hash(password)
 
     @classmethod
     def verify_password(cls, password: str, hashed_password: str) -> bool:
@@ -31,4 +67,139 @@ class PasswordHandler:
         Returns:
             bool: True if the password is correct, False otherwise.
         """
-        return cls.password_hasher.verify(password, hashed_password)
+        return cls.get_hasher().verify(password, hashed_password)
+
+    @classmethod
+    def verify_and_update(
+        cls, password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        """Verify a password, rehashing it if its hash uses outdated parameters.
+
+        Args:
+            password (str): The password to verify.
+            hashed_password (str): The hashed password to compare against.
+
+        Returns:
+            tuple[bool, str | None]: True if the password is correct, False
+                otherwise, and the new hash if the password must be rehashed.
+        """
+        return cls.get_hasher().verify_and_update(password, hashed_password)
+
+    @classmethod
+    async def hash_password_async(cls, password: str) -> str:
+        """Hash a password in the worker pool, without blocking the event loop.
+
+        Args:
+            password (str): The password to hash.
+
+        Returns:
+            str: The hashed password.
+
+        Raises:
+            PasswordQueueFullException: If the worker pool queue is full.
+        """
+        return await cls._run_in_pool(cls.hash_password, password)
+
+    @classmethod
+    async def verify_password_async(cls, password: str, hashed_password: str) -> bool:
+        """Verify a password in the worker pool, without blocking the event loop.
+
+        Args:
+            password (str): The password to verify.
+            hashed_password (str): The hashed password to compare against.
+
+        Returns:
+            bool: True if the password is correct, False otherwise.
+
+        Raises:
+            PasswordQueueFullException: If the worker pool queue is full.
+        """
+        return await cls._run_in_pool(cls.verify_password, password, hashed_password)
+
+    @classmethod
+    async def verify_and_update_async(
+        cls, password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        """Verify and update a password in the worker pool.
+
+        Args:
+            password (str): The password to verify.
+            hashed_password (str): The hashed password to compare against.
+
+        Returns:
+            tuple[bool, str | None]: True if the password is correct, False
+                otherwise, and the new hash if the password must be rehashed.
+
+        Raises:
+            PasswordQueueFullException: If the worker pool queue is full.
+        """
+        return await cls._run_in_pool(cls.verify_and_update, password, hashed_password)
+
+    @classmethod
+    def get_stats(cls) -> dict[str, int]:
+        """Get the worker pool counters.
+
+        Returns:
+            dict[str, int]: The jobs running or waiting and the pool capacity.
+        """
+        return {
+            "in_flight": cls._in_flight,
+            "capacity": password_settings.PASSWORD_WORKERS
+            + password_settings.PASSWORD_QUEUE_SIZE,
+        }
+
+    @classmethod
+    def get_executor(cls) -> Executor:
+        """Get the worker pool, creating it on first use.
+
+        Returns:
+            Executor: The thread or process pool used for hashing.
+        """
+        if cls._executor is None:
+            if password_settings.PASSWORD_EXECUTOR == "process":
+                cls._executor = ProcessPoolExecutor(
+                    max_workers=password_settings.PASSWORD_WORKERS
+                )
+            else:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=password_settings.PASSWORD_WORKERS,
+                    thread_name_prefix="password-hasher",
+                )
+        return cls._executor
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Shutdown the worker pool, waiting for the running jobs."""
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=True)
+            cls._executor = None
+
+    @classmethod
+    async def _run_in_pool(cls, func, *args):
+        """Run a hashing function in the worker pool.
+
+        The number of jobs running or waiting in the pool is bounded by the
+        amount of workers plus the queue size, extra jobs are rejected.
+
+        Args:
+            func (): The function to be executed.
+            *args: The function arguments.
+
+        Returns:
+            any: The function result.
+
+        Raises:
+            PasswordQueueFullException: If the worker pool queue is full.
+        """
+        capacity = (
+            password_settings.PASSWORD_WORKERS + password_settings.PASSWORD_QUEUE_SIZE
+        )
+        if cls._in_flight >= capacity:
+            raise PasswordQueueFullException()
+        cls._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            with password_duration.time(operation=func.__name__):
+                return await loop.run_in_executor(cls.get_executor(), func, *args)
+        finally:
+            cls._in_flight -= 1
@@ -1,9 +1,13 @@
 """Module for the access groups services."""
 
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import select
+from sqlalchemy import Select, and_, or_, select
+from typing import AsyncIterator
 from uuid import UUID
+from datetime import datetime
 
+from src.app.settings import cache_settings
 from src.database.database import Database
 from src.database.tables import access_groups_table
 from src.exceptions.access_groups import (
@@ -11,14 +15,28 @@ from src.exceptions.access_groups import (
     AccessGroupIdUUIDException,
     EmailAlreadyInUseException,
     InvalidCredentialsException,
+    InvalidCursorException,
 )
 from src.schema.access_groups import AccessGroupRequest, AccessGroupResponse
 from src.schema.passw import PasswordHandler
+from src.service.cache import TTLCache
 from src.service.utils import UtilsService
 
 
 class AccessGroupsService:
-    """Service class for access groups."""
+    """Service class for access groups.
+
+    The groups read by id and email are kept in a read-through cache,
+    including the password hash, since they almost never change. Unknown
+    emails are cached for a shorter time. Each worker keeps its own cache, so
+    a group created in another worker may be unknown to this one for up to
+    ACCESS_GROUP_NEGATIVE_TTL seconds.
+    """
+
+    group_cache = TTLCache(
+        max_size=cache_settings.ACCESS_GROUP_CACHE_SIZE,
+        ttl=cache_settings.ACCESS_GROUP_CACHE_TTL,
+    )
 
     @classmethod
     async def create_access_group(
@@ -35,6 +53,7 @@ class AccessGroupsService:
         Raises:
             EmailAlreadyInUseException: Raised when an email is already in use.
         """
+        hashed_password = await PasswordHandler.hash_password_async(request.password)
         group_id = UtilsService.create_uuid()
         date_created = UtilsService.get_current_datetime()
 
@@ -42,13 +61,22 @@ class AccessGroupsService:
             id=group_id,
             name=request.name,
             email=request.email,
-            password=request.password,
-            date_created=date_created,
+            password=hashed_password,
+            date_created=date_created.replace(tzinfo=None),
         )
         try:
             await Database.execute(query)
         except IntegrityError:
             raise EmailAlreadyInUseException(email=request.email)
+        cls._cache_group(
+            {
+                "id": group_id,
+                "name": request.name,
+                "email": request.email,
+                "password": hashed_password,
+                "date_created": date_created,
+            }
+        )
         return AccessGroupResponse(
             id=group_id,
             name=request.name,
@@ -57,20 +85,116 @@ class AccessGroupsService:
         )
 
     @classmethod
-    async def get_all(cls) -> list[AccessGroupResponse]:
-        """Get all access groups.
+    async def get_all(
+        cls, limit: int, cursor: str | None = None
+    ) -> tuple[list[AccessGroupResponse], str | None]:
+        """Get a page of access groups, ordered by creation.
+
+        Args:
+            limit (int): The maximum number of access groups.
+            cursor (str | None): The cursor returned by the previous page.
 
         Returns:
-            list[AccessGroupResponse]: All the access groups.
+            tuple[list[AccessGroupResponse], str | None]: The access groups and
+                the cursor of the next page, None if it is the last one.
+
+        Raises:
+            InvalidCursorException: Raised when the cursor is invalid.
+        """
+        query = cls._query_after(cursor).limit(limit + 1)
+        rows = await Database.fetch_all(query)
+        groups = [cls._build_response(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = cls._encode_cursor(groups[-1])
+        return groups, next_cursor
+
+    @classmethod
+    def stream_all(
+        cls, cursor: str | None = None
+    ) -> AsyncIterator[AccessGroupResponse]:
+        """Stream all the access groups, ordered by creation.
+
+        Args:
+            cursor (str | None): The cursor to start after.
+
+        Returns:
+            AsyncIterator[AccessGroupResponse]: The access groups, read through a
+                server-side cursor.
+
+        Raises:
+            InvalidCursorException: Raised when the cursor is invalid.
+        """
+        query = cls._query_after(cursor)
+        return (cls._build_response(row) async for row in Database.stream(query))
+
+    @classmethod
+    def _query_after(cls, cursor: str | None) -> Select:
+        """Build the keyset query of the access groups after a cursor.
+
+        Args:
+            cursor (str | None): The pagination cursor.
+
+        Returns:
+            Select: The query ordered by creation date and id.
+
+        Raises:
+            InvalidCursorException: Raised when the cursor is invalid.
         """
         query = select(
             access_groups_table.c.id,
             access_groups_table.c.name,
             access_groups_table.c.email,
             access_groups_table.c.date_created,
+        ).order_by(access_groups_table.c.date_created, access_groups_table.c.id)
+        if cursor is None:
+            return query
+        date_created, group_id = cls._decode_cursor(cursor)
+        return query.where(
+            or_(
+                access_groups_table.c.date_created > date_created,
+                and_(
+                    access_groups_table.c.date_created == date_created,
+                    access_groups_table.c.id > group_id,
+                ),
+            )
         )
-        rows = await Database.fetch_all(query)
-        return [AccessGroupResponse(**row) for row in rows]
+
+    @classmethod
+    def _encode_cursor(cls, group: AccessGroupResponse) -> str:
+        """Encode the opaque cursor pointing after an access group.
+
+        Args:
+            group (AccessGroupResponse): The last access group of a page.
+
+        Returns:
+            str: The cursor.
+        """
+        value = f"{group.date_created.isoformat()}|{group.id.hex}"
+        return urlsafe_b64encode(value.encode()).decode()
+
+    @classmethod
+    def _decode_cursor(cls, cursor: str) -> tuple[datetime, UUID]:
+        """Decode an opaque cursor.
+
+        Args:
+            cursor (str): The cursor.
+
+        Returns:
+            tuple[datetime, UUID]: The creation date, in the naive application
+                wall time stored in the database, and id to start after.
+
+        Raises:
+            InvalidCursorException: Raised when the cursor is invalid.
+        """
+        try:
+            date_created, group_id = urlsafe_b64decode(cursor).decode().split("|")
+            date_created = UtilsService.get_aware_datetime(
+                datetime.fromisoformat(date_created)
+            )
+            return date_created.replace(tzinfo=None), UUID(group_id)
+        except ValueError:
+            raise InvalidCursorException()
 
     @classmethod
     async def get_by_id(cls, id: str) -> AccessGroupResponse:
@@ -90,21 +214,25 @@ class AccessGroupsService:
         except ValueError:
             raise AccessGroupIdUUIDException()
         valid_id = UUID(id)
-        query = select(
-            access_groups_table.c.id,
-            access_groups_table.c.name,
-            access_groups_table.c.email,
-            access_groups_table.c.date_created,
-        ).where(access_groups_table.c.id == valid_id)
-        row = await Database.fetch_one(query)
-        if not row:
-            raise AccessGroupNotFoundException(id=id)
-        return AccessGroupResponse(**row)
+        row = cls.group_cache.get(("id", valid_id))
+        if row is None:
+            query = select(access_groups_table).where(
+                access_groups_table.c.id == valid_id
+            )
+            row = await Database.fetch_one(query)
+            if not row:
+                raise AccessGroupNotFoundException(id=id)
+            row = cls._cache_group(row)
+        return cls._build_response(row)
 
     @classmethod
     async def authenticate_group(cls, email: str, password: str) -> UUID:
         """Authenticate access group.
 
+        A password hashed with outdated cost parameters is rehashed with the
+        current ones and saved. The connection of the unit of work is released
+        while the password is verified.
+
         Args:
             email (str): The group email.
             password (str): The group password.
@@ -115,12 +243,81 @@ class AccessGroupsService:
         Raises:
             InvalidCredentialsException: Raised when the credentials are invalid.
         """
-        query = select(access_groups_table.c.id, access_groups_table.c.password).where(
-            access_groups_table.c.email == email
-        )
-        row = await Database.fetch_one(query)
+        row = await cls._get_by_email(email)
         if not row:
             raise InvalidCredentialsException()
-        if PasswordHandler.verify_password(password, row.get("password")) is False:
+        await Database.release()
+        is_valid, updated_hash = await PasswordHandler.verify_and_update_async(
+            password, row.get("password")
+        )
+        if is_valid is False:
             raise InvalidCredentialsException()
+        if updated_hash is not None:
+            query_update = (
+                access_groups_table.update()
+                .where(access_groups_table.c.id == row.get("id"))
+                .values(password=updated_hash)
+            )
+            await Database.execute(query_update)
+            cls._cache_group({**row, "password": updated_hash})
         return row.get("id")
+
+    @classmethod
+    async def _get_by_email(cls, email: str) -> dict | None:
+        """Get an access group row by email, through the cache.
+
+        Args:
+            email (str): The group email.
+
+        Returns:
+            dict | None: The access group row, with the password hash, None if
+                there is no group with the email.
+        """
+        row = cls.group_cache.get(("email", email))
+        if row is not None:
+            # False marks an email cached as unknown
+            return row or None
+        query = select(access_groups_table).where(access_groups_table.c.email == email)
+        row = await Database.fetch_one(query)
+        if not row:
+            cls.group_cache.set(
+                ("email", email), False, ttl=cache_settings.ACCESS_GROUP_NEGATIVE_TTL
+            )
+            return None
+        return cls._cache_group(row)
+
+    @classmethod
+    def _build_response(cls, row: dict) -> AccessGroupResponse:
+        """Build the response of an access group row, without validation.
+
+        Args:
+            row (dict): The access group row.
+
+        Returns:
+            AccessGroupResponse: The access group, created in the application
+                timezone.
+        """
+        return AccessGroupResponse.model_construct(
+            id=row["id"],
+            name=row["name"],
+            email=row["email"],
+            date_created=UtilsService.get_aware_datetime(row["date_created"]),
+        )
+
+    @classmethod
+    def _cache_group(cls, row: dict) -> dict:
+        """Cache an access group row by id and by email, replacing the old one.
+
+        Args:
+            row (dict): The access group row, with the password hash.
+
+        Returns:
+            dict: The cached row.
+        """
+        row = {
+            **row,
+            "date_created": UtilsService.get_aware_datetime(row["date_created"]),
+        }
+        cls.group_cache.set(("id", row["id"]), row)
+        cls.group_cache.set(("email", row["email"]), row)
+        return row
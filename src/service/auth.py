@@ -3,74 +3,155 @@
 import jwt
 from uuid import UUID
 
-from src.app.settings import jwt_settings
-from src.database.database import Database
-from src.database.tables import jwts_table
+from src.app.metrics import tokens_issued, tokens_revoked, tokens_verified
+from src.app.settings import cache_settings, jwt_settings, refresh_settings
 from src.exceptions.auth import ExpiredTokenException, InvalidTokenException
-from src.schema.auth import Jwt, JwtRequest, JwtResponse, VerifyJwtRequest
+from src.schema.auth import (
+    Jwt,
+    JwtResponse,
+    VerifyJwtRequest,
+    VerifyJwtResult,
+)
+from src.service.cache import TTLCache
+from src.service.keyring import Keyring
+from src.service.refresh_buffer import RefreshBuffer
 from src.service.utils import UtilsService
+from src.store.base import TokenUse
+from src.store.factory import get_token_store
 
 
 class AuthService:
     """Auth service class."""
 
+    token_cache = TTLCache(
+        max_size=cache_settings.TOKEN_CACHE_SIZE, ttl=cache_settings.TOKEN_CACHE_TTL
+    )
+
     @classmethod
-    async def create_jwt(cls, request: JwtRequest, group_id: UUID) -> JwtResponse:
+    async def create_jwt(cls, group_id: UUID) -> JwtResponse:
         """Create a jwt token.
 
         Args:
-            request (JwtRequest): The user payload.
-            group_name (UUID): The access group id.
+            group_id (UUID): The access group id.
 
         Returns:
             JwtResponse: The jwt token.
         """
-        payload = request.model_dump()
-        date_created = UtilsService.get_current_datetime()
-        payload["timestamp"] = (
-            UtilsService.get_int_timestamp(date_created) + jwt_settings.JWT_VALID_TIME
-        )
-        encoded = jwt.encode(
-            payload=payload,
-            key=jwt_settings.JWT_KEY,
-            algorithm=jwt_settings.JWT_ALGORITHM,
+        tokens = await cls.create_jwts(group_id, 1)
+        return tokens[0]
+
+    @classmethod
+    async def create_jwts(cls, group_id: UUID, count: int) -> list[JwtResponse]:
+        """Create many jwt tokens, stored at once.
+
+        Args:
+            group_id (UUID): The access group id.
+            count (int): The number of tokens.
+
+        Returns:
+            list[JwtResponse]: The jwt tokens.
+        """
+        issued_at = UtilsService.get_int_timestamp()
+        tokens = [cls._sign_jwt(group_id, issued_at) for _ in range(count)]
+        await get_token_store().issue(tokens)
+        tokens_issued.inc(count)
+        return [cls.to_response(token) for token in tokens]
+
+    @classmethod
+    def to_response(cls, token: Jwt) -> JwtResponse:
+        """Build the response of a Jwt, without validating it again.
+
+        The epoch seconds are presented as datetimes in the APP_TIMEZONE.
+
+        Args:
+            token (Jwt): The jwt, built by the service or read from the store.
+
+        Returns:
+            JwtResponse: The jwt response.
+        """
+        return JwtResponse.model_construct(
+            id=token.id,
+            access_group=token.access_group,
+            signature=token.signature,
+            valid_until=UtilsService.get_timestamp_from_int(token.valid_until),
+            date_created=UtilsService.get_timestamp_from_int(token.date_created),
         )
+
+    @classmethod
+    def _sign_jwt(cls, group_id: UUID, issued_at: int) -> Jwt:
+        """Sign a new jwt token.
+
+        Only the registered claims are embedded: the access group as subject,
+        the token id as jti and its issue and expiration times.
+
+        Args:
+            group_id (UUID): The access group id.
+            issued_at (int): When the token was created, in epoch seconds.
+
+        Returns:
+            Jwt: The new token.
+        """
         token_id = UtilsService.create_uuid()
-        valid_until = UtilsService.get_timestamp_from_int(payload["timestamp"])
-        query = jwts_table.insert().values(
-            id=token_id,
-            access_group=group_id,
-            signature=encoded,
-            valid_until=valid_until,
-            date_created=date_created,
-        )
-        await Database.execute(query)
-        return JwtResponse(
+        payload = {
+            "sub": str(group_id),
+            "exp": issued_at + jwt_settings.JWT_VALID_TIME,
+            "iat": issued_at,
+            "jti": str(token_id),
+        }
+        encoded = Keyring.encode(payload)
+        return Jwt(
             id=token_id,
             access_group=group_id,
             signature=encoded,
-            valid_until=valid_until,
-            date_created=date_created,
+            valid_until=payload["exp"],
+            date_created=issued_at,
+            times_refreshed=0,
         )
 
     @classmethod
-    async def decode_jwt(cls, token: str) -> dict:
+    async def decode_jwt(cls, token: str, verify_exp: bool = True) -> dict:
         """Decode a jwt token.
 
+        Verifies the signature and the embedded expiry, accepting tokens that
+        can still be alive through refreshes. The subject and jti claims are
+        parsed as UUIDs.
+
         Args:
             token: The jwt token to be decoded.
+            verify_exp (bool): Whether the expiry is verified.
 
         Returns:
             dict: The decoded token.
+
+        Raises:
+            ExpiredTokenException: If the token can no longer be refreshed.
+            InvalidTokenException: If the token is malformed or tampered.
         """
-        return jwt.decode(
-            jwt=token, key=jwt_settings.JWT_KEY, algorithms=[jwt_settings.JWT_ALGORITHM]
-        )
+        try:
+            payload = Keyring.decode(
+                token,
+                leeway=jwt_settings.JWT_MAX_REFRESH_TIME,
+                options={
+                    "require": ["sub", "exp", "iat", "jti"],
+                    "verify_exp": verify_exp,
+                },
+            )
+            payload["sub"] = UUID(payload["sub"])
+            payload["jti"] = UUID(payload["jti"])
+        except jwt.ExpiredSignatureError:
+            raise ExpiredTokenException()
+        except (jwt.InvalidTokenError, ValueError, TypeError):
+            raise InvalidTokenException()
+        return payload
 
     @classmethod
     async def use_token(cls, request: VerifyJwtRequest) -> JwtResponse:
         """Use the JWT.
 
+        Without write-behind every use is checked and saved in the token store
+        at once, so a token revoked by another worker is rejected right away.
+        With it, the uses are answered from the token cache and written later.
+
         Args:
             request (VerifyJwtRequest): Request data.
 
@@ -81,52 +162,326 @@ class AuthService:
             ExpiredTokenException: If the token expired.
             InvalidTokenException: If the token is invalid.
         """
-        query_verify = (
-            jwts_table.select()
-            .where(jwts_table.c.signature == request.signature)
-            .where(jwts_table.c.access_group == request.access_group)
-        )
-        row_verify = await Database.fetch_one(query_verify)
+        try:
+            payload = await cls.decode_jwt(request.signature)
+            if payload["sub"] != request.access_group:
+                raise InvalidTokenException()
+
+            if not refresh_settings.REFRESH_WRITE_BEHIND:
+                token = await cls.use_stored_token(request, payload)
+            else:
+                signature_digest = UtilsService.get_signature_digest(request.signature)
+                token = cls.token_cache.get(signature_digest)
+                if token is None:
+                    tokens = await get_token_store().lookup([payload["jti"]])
+                    token = tokens.get(payload["jti"])
+
+                    if token is None or token.signature != request.signature:
+                        raise InvalidTokenException()
+
+                    token = RefreshBuffer.apply(token)
+
+                token = cls.refresh_token(token, request, payload)
+                RefreshBuffer.add(token)
+                cls.cache_token(signature_digest, token)
+        except ExpiredTokenException:
+            tokens_verified.inc(result="expired")
+            raise
+        except InvalidTokenException:
+            tokens_verified.inc(result="invalid")
+            raise
+        tokens_verified.inc(result="valid")
+
+        return cls.to_response(token)
+
+    @classmethod
+    async def use_tokens(
+        cls, requests: list[VerifyJwtRequest]
+    ) -> list[VerifyJwtResult]:
+        """Use many JWTs at once.
+
+        Args:
+            requests (list[VerifyJwtRequest]): The tokens to be verified.
+
+        Returns:
+            list[VerifyJwtResult]: The result of each token, in the same order.
+        """
+        results: list[VerifyJwtResult | None] = []
+        pending: dict[int, tuple[VerifyJwtRequest, dict]] = {}
+        for index, request in enumerate(requests):
+            try:
+                payload = await cls.decode_jwt(request.signature)
+                if payload["sub"] != request.access_group:
+                    raise InvalidTokenException()
+                pending[index] = (request, payload)
+                results.append(None)
+            except (ExpiredTokenException, InvalidTokenException) as exception:
+                results.append(VerifyJwtResult(valid=False, detail=exception.detail))
+
+        if refresh_settings.REFRESH_WRITE_BEHIND:
+            verified = await cls.refresh_buffered_tokens(pending)
+        else:
+            verified = await cls.use_stored_tokens(pending)
+        for index, token in verified.items():
+            if isinstance(token, Jwt):
+                results[index] = VerifyJwtResult(
+                    valid=True, token=cls.to_response(token)
+                )
+            else:
+                results[index] = VerifyJwtResult(valid=False, detail=token.detail)
+
+        for result in results:
+            if result.valid:
+                tokens_verified.inc(result="valid")
+            elif result.detail == ExpiredTokenException.DETAIL:
+                tokens_verified.inc(result="expired")
+            else:
+                tokens_verified.inc(result="invalid")
+        return results
+
+    @classmethod
+    async def use_stored_tokens(
+        cls, pending: dict[int, tuple[VerifyJwtRequest, dict]]
+    ) -> dict[int, Jwt | ExpiredTokenException | InvalidTokenException]:
+        """Verify and refresh many Jwts in the token store, one conditional
+        update each.
+
+        Args:
+            pending (dict[int, tuple[VerifyJwtRequest, dict]]): The requests
+                and decoded jwts, by index.
+
+        Returns:
+            dict[int, Jwt | ExpiredTokenException | InvalidTokenException]: The
+                refreshed jwt, or why it could not be used, by index.
+        """
+        current_timestamp = UtilsService.get_int_timestamp()
+        token_store = get_token_store()
+        verified = {}
+        failed: dict[int, TokenUse] = {}
+        for index, (request, payload) in pending.items():
+            token_use = cls.get_token_use(request, payload, current_timestamp)
+            token = await token_store.use(token_use)
+            if token is None:
+                failed[index] = token_use
+            else:
+                verified[index] = token
+
+        if failed:
+            # Look the tokens up only to tell why they could not be used
+            tokens = await token_store.lookup(
+                {token_use.token_id for token_use in failed.values()}
+            )
+            for index, token_use in failed.items():
+                verified[index] = cls.get_use_exception(
+                    tokens.get(token_use.token_id), token_use
+                )
+        return verified
+
+    @classmethod
+    async def refresh_buffered_tokens(
+        cls, pending: dict[int, tuple[VerifyJwtRequest, dict]]
+    ) -> dict[int, Jwt | ExpiredTokenException | InvalidTokenException]:
+        """Refresh many Jwts read from the token cache or store, buffering the
+        refreshes.
+
+        Args:
+            pending (dict[int, tuple[VerifyJwtRequest, dict]]): The requests
+                and decoded jwts, by index.
+
+        Returns:
+            dict[int, Jwt | ExpiredTokenException | InvalidTokenException]: The
+                refreshed jwt, or why it could not be used, by index.
+        """
+        tokens: dict[UUID, Jwt] = {}
+        missing = set()
+        for request, payload in pending.values():
+            if payload["jti"] in tokens:
+                continue
+            digest = UtilsService.get_signature_digest(request.signature)
+            token = cls.token_cache.get(digest)
+            if token is None:
+                missing.add(payload["jti"])
+            else:
+                tokens[payload["jti"]] = token
+        for token_id, token in (await get_token_store().lookup(missing)).items():
+            tokens[token_id] = RefreshBuffer.apply(token)
+
+        verified = {}
+        refreshed: dict[UUID, Jwt] = {}
+        for index, (request, payload) in pending.items():
+            try:
+                token = tokens.get(payload["jti"])
+                if token is None or token.signature != request.signature:
+                    raise InvalidTokenException()
+                token = cls.refresh_token(token, request, payload)
+            except (ExpiredTokenException, InvalidTokenException) as exception:
+                verified[index] = exception
+                continue
+            tokens[payload["jti"]] = refreshed[payload["jti"]] = token
+            verified[index] = token
+            RefreshBuffer.add(token)
+
+        for token in refreshed.values():
+            digest = UtilsService.get_signature_digest(token.signature)
+            cls.cache_token(digest, token)
+        return verified
+
+    @classmethod
+    async def revoke_token(cls, request: VerifyJwtRequest) -> None:
+        """Revoke the JWT, deleting it.
+
+        Args:
+            request (VerifyJwtRequest): Request data.
+
+        Raises:
+            InvalidTokenException: If the token is invalid.
+        """
+        payload = await cls.decode_jwt(request.signature, verify_exp=False)
+        if payload["sub"] != request.access_group:
+            raise InvalidTokenException()
 
-        if not row_verify:
+        cls.token_cache.invalidate(UtilsService.get_signature_digest(request.signature))
+        if not await get_token_store().revoke(payload["jti"], request.access_group):
             raise InvalidTokenException()
+        tokens_revoked.inc()
+
+    @classmethod
+    async def use_stored_token(cls, request: VerifyJwtRequest, payload: dict) -> Jwt:
+        """Verify and refresh a Jwt in the token store, in a single operation.
+
+        Args:
+            request (VerifyJwtRequest): Request data.
+            payload (dict): The decoded jwt.
 
-        token = Jwt(**row_verify)
+        Returns:
+            Jwt: The refreshed jwt, already saved.
 
+        Raises:
+            ExpiredTokenException: If the token expired.
+            InvalidTokenException: If the token is invalid.
+        """
         current_timestamp = UtilsService.get_int_timestamp()
-        valid_until = UtilsService.get_int_timestamp(token.valid_until)
+        token_store = get_token_store()
+        token_use = cls.get_token_use(request, payload, current_timestamp)
+        token = await token_store.use(token_use)
+        if token is not None:
+            return token
 
-        if current_timestamp > valid_until:
-            raise ExpiredTokenException()
+        # Look the token up only to tell why it could not be used
+        token = (await token_store.lookup([payload["jti"]])).get(payload["jti"])
+        raise cls.get_use_exception(token, token_use)
 
-        if (valid_until - current_timestamp) < 60:
-            valid_until = valid_until + 60
+    @classmethod
+    def get_token_use(
+        cls, request: VerifyJwtRequest, payload: dict, current_timestamp: int
+    ) -> TokenUse:
+        """Build the verification of a stored Jwt.
 
-        await cls.refresh_token(token, valid_until)
+        Args:
+            request (VerifyJwtRequest): Request data.
+            payload (dict): The decoded jwt.
+            current_timestamp (int): The timestamp of the use.
 
-        return JwtResponse(
-            id=token.id,
-            access_group=token.access_group,
-            signature=token.signature,
-            valid_until=UtilsService.get_timestamp_from_int(valid_until),
-            date_created=token.date_created,
+        Returns:
+            TokenUse: The verification, extending the token in its last minute.
+        """
+        return TokenUse(
+            token_id=payload["jti"],
+            signature=request.signature,
+            access_group=request.access_group,
+            used_at=current_timestamp,
+            extend_before=current_timestamp + 60,
+            extended_until=cls.get_extended_timestamp(current_timestamp, payload),
         )
 
     @classmethod
-    async def refresh_token(cls, token: Jwt, valid_until: int) -> None:
-        """Refresh the Jwt.
+    def get_use_exception(
+        cls, token: Jwt | None, token_use: TokenUse
+    ) -> ExpiredTokenException | InvalidTokenException:
+        """Get why a stored Jwt could not be used.
 
         Args:
-            token (Jwt): The jwt to be updated.
-            valid_until (int): When the token expires.
+            token (Jwt | None): The stored jwt, None if it was not found.
+            token_use (TokenUse): The failed verification.
+
+        Returns:
+            ExpiredTokenException | InvalidTokenException: The expired exception
+                if the token matches the use but has expired, the invalid one
+                otherwise.
         """
-        query_update = (
-            jwts_table.update()
-            .where(jwts_table.c.id == token.id)
-            .values(
-                valid_until=UtilsService.get_timestamp_from_int(valid_until),
-                last_refresh=UtilsService.get_current_datetime(),
-                times_refreshed=token.times_refreshed + 1,
+        if (
+            token is not None
+            and token.signature == token_use.signature
+            and token.access_group == token_use.access_group
+            and token.valid_until < token_use.used_at
+        ):
+            return ExpiredTokenException()
+        return InvalidTokenException()
+
+    @classmethod
+    def get_extended_timestamp(cls, current_timestamp: int, payload: dict) -> int:
+        """Get the expiration of a token extended on use.
+
+        A token used in its last minute stays valid for a minute after the use,
+        up to JWT_MAX_REFRESH_TIME past its original expiration.
+
+        Args:
+            current_timestamp (int): The timestamp of the use.
+            payload (dict): The decoded jwt.
+
+        Returns:
+            int: The extended expiration timestamp.
+        """
+        return min(
+            current_timestamp + 60, payload["exp"] + jwt_settings.JWT_MAX_REFRESH_TIME
+        )
+
+    @classmethod
+    def refresh_token(cls, token: Jwt, request: VerifyJwtRequest, payload: dict) -> Jwt:
+        """Check a stored Jwt and build its refreshed copy.
+
+        Args:
+            token (Jwt): The stored jwt.
+            request (VerifyJwtRequest): Request data.
+            payload (dict): The decoded jwt.
+
+        Returns:
+            Jwt: The refreshed jwt, not yet saved.
+
+        Raises:
+            ExpiredTokenException: If the token expired.
+            InvalidTokenException: If the token is invalid.
+        """
+        if token.access_group != request.access_group:
+            raise InvalidTokenException()
+
+        current_timestamp = UtilsService.get_int_timestamp()
+        valid_until = token.valid_until
+
+        if current_timestamp > valid_until:
+            cls.token_cache.invalidate(
+                UtilsService.get_signature_digest(token.signature)
             )
+            raise ExpiredTokenException()
+
+        if (valid_until - current_timestamp) < 60:
+            valid_until = cls.get_extended_timestamp(current_timestamp, payload)
+
+        return token.model_copy(
+            update={
+                "valid_until": valid_until,
+                "last_refresh": current_timestamp,
+                "times_refreshed": token.times_refreshed + 1,
+            }
         )
-        await Database.execute(query_update)
+
+    @classmethod
+    def cache_token(cls, signature_digest: bytes, token: Jwt) -> None:
+        """Cache a verified Jwt until it expires.
+
+        Args:
+            signature_digest (bytes): The jwt signature digest.
+            token (Jwt): The verified jwt.
+        """
+        ttl = token.valid_until - UtilsService.get_int_timestamp()
+        cls.token_cache.set(signature_digest, token, ttl=ttl)
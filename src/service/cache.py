@@ -0,0 +1,95 @@
+"""Module for the in-memory caches used by the services."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """Bounded in-memory cache with LRU eviction and per-entry TTL.
+
+    The cache lives in the process memory, so each worker keeps its own copy.
+    A max size of zero disables the cache.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        """Constructor for the class.
+
+        Args:
+            max_size (int): The maximum number of entries.
+            ttl (float): The default time to live of an entry, in seconds.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any | None:
+        """Get an entry from the cache.
+
+        Args:
+            key (Hashable): The entry key.
+
+        Returns:
+            Any | None: The cached value, None if missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Add or replace an entry, evicting the least recently used if full.
+
+        Args:
+            key (Hashable): The entry key.
+            value (Any): The value to be cached.
+            ttl (float | None): The entry time to live, capped at the default.
+        """
+        if self.max_size <= 0:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            self._entries.pop(key, None)
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove an entry from the cache.
+
+        Args:
+            key (Hashable): The entry key.
+        """
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all the entries from the cache."""
+        self._entries.clear()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """The cache counters.
+
+        Returns:
+            dict[str, int]: The hits, misses, evictions and current size.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+        }
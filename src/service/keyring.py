@@ -0,0 +1,199 @@
+"""Module for the jwt signing keys."""
+
+import json
+import hashlib
+import jwt
+from pathlib import Path
+from dataclasses import dataclass
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from cryptography.hazmat.primitives.serialization import (
+    load_pem_private_key,
+    load_pem_public_key,
+)
+
+from src.app.metrics import jwt_duration
+from src.app.settings import jwt_settings
+
+
+@dataclass(frozen=True, slots=True)
+class SigningKey:
+    """A parsed key of the keyring."""
+
+    kid: str | None
+    algorithm: str
+    verifying_key: object
+    signing_key: object | None = None
+
+
+class Keyring:
+    """Keys used to sign and verify the jwt tokens, parsed once at startup.
+
+    With an HMAC algorithm the shared JWT_KEY is used. With RS256, ES256,
+    ES384, ES512 or EdDSA the active private key signs the tokens, with its kid
+    in the header, and the retiring public keys are still accepted when
+    verifying them.
+    """
+
+    curve_algorithms: dict[str, str] = {
+        "secp256r1": "ES256",
+        "secp384r1": "ES384",
+        "secp521r1": "ES512",
+    }
+
+    active: SigningKey | None = None
+    keys: dict[str | None, SigningKey] = {}
+    jwks: bytes = b'{"keys":[]}'
+    jwks_etag: str = ""
+
+    @classmethod
+    def load(cls) -> None:
+        """Load and parse the keys from the settings."""
+        if jwt_settings.JWT_ALGORITHM.startswith("HS"):
+            active = SigningKey(
+                kid=None,
+                algorithm=jwt_settings.JWT_ALGORITHM,
+                verifying_key=jwt_settings.JWT_KEY,
+                signing_key=jwt_settings.JWT_KEY,
+            )
+            retiring = []
+        else:
+            path = Path(jwt_settings.JWT_PRIVATE_KEY_PATH)
+            private_key = load_pem_private_key(path.read_bytes(), password=None)
+            algorithm = cls.get_algorithm(private_key.public_key(), path)
+            if not isinstance(private_key, rsa.RSAPrivateKey) and (
+                algorithm != jwt_settings.JWT_ALGORITHM
+            ):
+                raise ValueError(
+                    f"The key in '{path}' signs with {algorithm}, "
+                    f"not JWT_ALGORITHM {jwt_settings.JWT_ALGORITHM}."
+                )
+            active = SigningKey(
+                kid=jwt_settings.JWT_KEY_ID or path.name.split(".")[0],
+                algorithm=jwt_settings.JWT_ALGORITHM,
+                verifying_key=private_key.public_key(),
+                signing_key=private_key,
+            )
+            retiring = [
+                cls._load_public_key(entry)
+                for entry in jwt_settings.JWT_RETIRING_KEY_PATHS
+            ]
+
+        cls.active = active
+        cls.keys = {key.kid: key for key in [*retiring, active]}
+        jwks = {
+            "keys": [
+                {
+                    **jwt.get_algorithm_by_name(key.algorithm).to_jwk(
+                        key.verifying_key, as_dict=True
+                    ),
+                    "kid": key.kid,
+                    "alg": key.algorithm,
+                    "use": "sig",
+                }
+                for key in cls.keys.values()
+                if key.kid is not None
+            ]
+        }
+        cls.jwks = json.dumps(jwks, separators=(",", ":")).encode()
+        cls.jwks_etag = f'"{hashlib.sha256(cls.jwks).hexdigest()[:32]}"'
+
+    @classmethod
+    def encode(cls, payload: dict) -> str:
+        """Sign a jwt token with the active key.
+
+        Args:
+            payload (dict): The token claims.
+
+        Returns:
+            str: The signed token.
+        """
+        if cls.active is None:
+            cls.load()
+        headers = {"kid": cls.active.kid} if cls.active.kid else None
+        with jwt_duration.time(operation="encode"):
+            return jwt.encode(
+                payload=payload,
+                key=cls.active.signing_key,
+                algorithm=cls.active.algorithm,
+                headers=headers,
+            )
+
+    @classmethod
+    def decode(cls, token: str, **options) -> dict:
+        """Verify and decode a jwt token with the key named in its header.
+
+        Args:
+            token (str): The jwt token.
+            **options: Extra options for jwt.decode.
+
+        Returns:
+            dict: The decoded token.
+
+        Raises:
+            jwt.InvalidTokenError: If the token is invalid or its key unknown.
+        """
+        if cls.active is None:
+            cls.load()
+        with jwt_duration.time(operation="decode"):
+            kid = jwt.get_unverified_header(token).get("kid")
+            key = cls.keys.get(kid)
+            if key is None:
+                raise jwt.InvalidTokenError(f"Unknown key id '{kid}'.")
+            return jwt.decode(
+                jwt=token, key=key.verifying_key, algorithms=[key.algorithm], **options
+            )
+
+    @classmethod
+    def get_algorithm(cls, public_key: object, path: Path) -> str:
+        """Get the signing algorithm of a public key.
+
+        Args:
+            public_key (object): The public key.
+            path (Path): The PEM file it was read from.
+
+        Returns:
+            str: RS256, ES256, ES384, ES512 or EdDSA.
+
+        Raises:
+            ValueError: If the key type or elliptic curve is not supported.
+        """
+        if isinstance(public_key, rsa.RSAPublicKey):
+            return "RS256"
+        if isinstance(public_key, ec.EllipticCurvePublicKey):
+            algorithm = cls.curve_algorithms.get(public_key.curve.name)
+            if algorithm is None:
+                raise ValueError(
+                    f"Unsupported elliptic curve {public_key.curve.name} in "
+                    f"'{path}', use P-256, P-384 or P-521."
+                )
+            return algorithm
+        if isinstance(public_key, ed25519.Ed25519PublicKey):
+            return "EdDSA"
+        raise ValueError(f"Unsupported key type in '{path}'.")
+
+    @classmethod
+    def _load_public_key(cls, entry: str) -> SigningKey:
+        """Load a retiring key, only used to verify tokens.
+
+        Args:
+            entry (str): The PEM file, of a public or private key, optionally
+                prefixed by its kid as "kid:path".
+
+        Returns:
+            SigningKey: The parsed key, with the given kid or else the file
+                name up to the first dot.
+        """
+        kid, separator, path = entry.partition(":")
+        if not separator:
+            kid, path = "", kid
+        path = Path(path)
+        data = path.read_bytes()
+        if b"PRIVATE KEY" in data:
+            public_key = load_pem_private_key(data, password=None).public_key()
+        else:
+            public_key = load_pem_public_key(data)
+        return SigningKey(
+            kid=kid or path.name.split(".")[0],
+            algorithm=cls.get_algorithm(public_key, path),
+            verifying_key=public_key,
+        )
@@ -0,0 +1,154 @@
+"""Module for the in-memory rate limiters used by the services."""
+
+import math
+import time
+from collections import OrderedDict
+from typing import Hashable
+
+from src.app.settings import login_limit_settings
+from src.exceptions.auth import TooManyLoginAttemptsException
+
+
+class TokenBucketLimiter:
+    """Bounded in-memory token buckets, one per key.
+
+    Each key can spend up to burst attempts at once, refilled at a constant
+    rate. The least recently used buckets are dropped when the limiter is
+    full, so each worker keeps its own bounded copy.
+    """
+
+    def __init__(self, burst: int, refill: float, max_keys: int) -> None:
+        """Constructor for the class.
+
+        Args:
+            burst (int): The maximum number of attempts at once.
+            refill (float): The attempts regained per second.
+            max_keys (int): The maximum number of buckets kept.
+        """
+        self.burst = burst
+        self.refill = refill
+        self.max_keys = max_keys
+        self.allowed = 0
+        self.rejected = 0
+        self._buckets: OrderedDict[Hashable, tuple[float, float]] = OrderedDict()
+
+    def acquire(self, key: Hashable) -> float:
+        """Spend an attempt from the bucket of a key.
+
+        Args:
+            key (Hashable): The bucket key.
+
+        Returns:
+            float: Zero if the attempt is allowed, otherwise the seconds until
+                the next attempt is available.
+        """
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated_at) * self.refill)
+        allowed = tokens >= 1
+        self._buckets[key] = (tokens - 1 if allowed else tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        if allowed:
+            self.allowed += 1
+            return 0.0
+        self.rejected += 1
+        return (1 - tokens) / self.refill if self.refill > 0 else math.inf
+
+    def refund(self, key: Hashable) -> None:
+        """Give back an attempt spent from the bucket of a key.
+
+        Args:
+            key (Hashable): The bucket key.
+        """
+        if key in self._buckets:
+            tokens, updated_at = self._buckets[key]
+            self._buckets[key] = (min(self.burst, tokens + 1), updated_at)
+
+    def clear(self) -> None:
+        """Remove all the buckets."""
+        self._buckets.clear()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """The limiter counters.
+
+        Returns:
+            dict[str, int]: The attempts allowed, rejected and keys tracked.
+        """
+        return {
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "keys": len(self._buckets),
+        }
+
+
+class LoginRateLimiter:
+    """Limits the login attempts by email and by client address.
+
+    The attempts are checked before the password verification, so the
+    Argon2 work spent on each email and client is bounded. The attempt of an
+    email is given back when the login succeeds, so only the failed ones
+    count against it.
+    """
+
+    by_email = TokenBucketLimiter(
+        burst=login_limit_settings.LOGIN_EMAIL_BURST,
+        refill=login_limit_settings.LOGIN_EMAIL_REFILL,
+        max_keys=login_limit_settings.LOGIN_LIMIT_MAX_KEYS,
+    )
+    by_client = TokenBucketLimiter(
+        burst=login_limit_settings.LOGIN_CLIENT_BURST,
+        refill=login_limit_settings.LOGIN_CLIENT_REFILL,
+        max_keys=login_limit_settings.LOGIN_LIMIT_MAX_KEYS,
+    )
+
+    @classmethod
+    def check(cls, email: str, client: str | None) -> None:
+        """Spend a login attempt of an email and a client.
+
+        Args:
+            email (str): The access group email.
+            client (str | None): The client address, if known.
+
+        Raises:
+            TooManyLoginAttemptsException: If any of the limits is exceeded.
+        """
+        if not login_limit_settings.LOGIN_LIMIT_ENABLED:
+            return
+        retry_after = 0.0
+        if client is not None:
+            retry_after = cls.by_client.acquire(client)
+        if not retry_after:
+            retry_after = cls.by_email.acquire(email.lower())
+        if retry_after:
+            seconds = str(math.ceil(min(retry_after, 86400)))
+            raise TooManyLoginAttemptsException(
+                headers={"Retry-After": seconds}, retry_after=seconds
+            )
+
+    @classmethod
+    def refund(cls, email: str) -> None:
+        """Give back the email attempt of a successful login.
+
+        Args:
+            email (str): The access group email.
+        """
+        if login_limit_settings.LOGIN_LIMIT_ENABLED:
+            cls.by_email.refund(email.lower())
+
+    @classmethod
+    def clear(cls) -> None:
+        """Reset all the limits."""
+        cls.by_email.clear()
+        cls.by_client.clear()
+
+    @classmethod
+    def get_stats(cls) -> dict[str, dict[str, int]]:
+        """Get the limiter counters.
+
+        Returns:
+            dict[str, dict[str, int]]: The counters by email and by client.
+        """
+        return {"email": cls.by_email.stats, "client": cls.by_client.stats}
@@ -0,0 +1,89 @@
+"""Module for the background reaper of expired tokens."""
+
+import time
+import asyncio
+import logging
+
+from src.app.settings import reaper_settings
+from src.service.utils import UtilsService
+from src.store.factory import get_token_store
+
+logger = logging.getLogger(__name__)
+
+
+class TokenReaper:
+    """Deletes the expired tokens in small chunks, in the background."""
+
+    runs: int = 0
+    rows_reaped: int = 0
+    seconds_spent: float = 0.0
+    _task: asyncio.Task | None = None
+
+    @classmethod
+    async def reap(cls) -> int:
+        """Delete the tokens expired for longer than the grace period.
+
+        The rows are deleted in chunks, pausing between them so the writes
+        do not starve the requests.
+
+        Returns:
+            int: The number of tokens deleted.
+        """
+        started = time.perf_counter()
+        cutoff = UtilsService.get_int_timestamp() - reaper_settings.REAPER_GRACE_PERIOD
+        token_store = get_token_store()
+        reaped = 0
+        try:
+            while True:
+                deleted = await token_store.purge(
+                    cutoff, reaper_settings.REAPER_CHUNK_SIZE
+                )
+                reaped += deleted
+                if deleted < reaper_settings.REAPER_CHUNK_SIZE:
+                    break
+                await asyncio.sleep(reaper_settings.REAPER_CHUNK_PAUSE)
+        finally:
+            cls.runs += 1
+            cls.rows_reaped += reaped
+            cls.seconds_spent += time.perf_counter() - started
+        return reaped
+
+    @classmethod
+    def get_stats(cls) -> dict[str, int | float]:
+        """Get the reaper counters.
+
+        Returns:
+            dict[str, int | float]: The runs, rows reaped and seconds spent.
+        """
+        return {
+            "runs": cls.runs,
+            "rows_reaped": cls.rows_reaped,
+            "seconds_spent": cls.seconds_spent,
+        }
+
+    @classmethod
+    def start(cls) -> None:
+        """Start the background task that reaps the tokens."""
+        if cls._task is None:
+            cls._task = asyncio.create_task(cls._run())
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Stop the background task."""
+        if cls._task is not None:
+            cls._task.cancel()
+            try:
+                await cls._task
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
+
+    @classmethod
+    async def _run(cls) -> None:
+        """Reap the tokens on every interval."""
+        while True:
+            await asyncio.sleep(reaper_settings.REAPER_INTERVAL)
+            try:
+                await cls.reap()
+            except Exception:
+                logger.exception("Failed to reap the expired tokens.")
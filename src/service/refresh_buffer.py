@@ -0,0 +1,141 @@
+"""Module for the write-behind buffer of token refreshes."""
+
+import asyncio
+import logging
+from uuid import UUID
+
+from src.app.settings import refresh_settings
+from src.schema.auth import Jwt
+from src.store.base import TokenRefresh, merge_refresh
+from src.store.factory import get_token_store
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshBuffer:
+    """Collects token refreshes in memory and writes them in batches.
+
+    Refreshes of the same token are merged, and the buffer is flushed in one
+    transaction every flush interval or when it reaches the flush size.
+    """
+
+    flushes: int = 0
+    flushed_refreshes: int = 0
+    _pending: dict[UUID, TokenRefresh] = {}
+    _flushing: dict[UUID, TokenRefresh] = {}
+    _task: asyncio.Task | None = None
+    _wake: asyncio.Event | None = None
+    _stopping: bool = False
+
+    @classmethod
+    def add(cls, token: Jwt) -> None:
+        """Add a token refresh to the buffer.
+
+        Args:
+            token (Jwt): The refreshed token.
+        """
+        merge_refresh(cls._pending, token)
+        if len(cls._pending) >= refresh_settings.REFRESH_FLUSH_SIZE and cls._wake:
+            cls._wake.set()
+
+    @classmethod
+    def apply(cls, token: Jwt) -> Jwt:
+        """Overlay the refreshes not yet written on a stored token.
+
+        Args:
+            token (Jwt): The token read from the store.
+
+        Returns:
+            Jwt: The token with its pending refreshes applied.
+        """
+        for buffer in (cls._flushing, cls._pending):
+            pending = buffer.get(token.id)
+            if pending is not None:
+                token = token.model_copy(
+                    update={
+                        "valid_until": pending.valid_until,
+                        "last_refresh": pending.last_refresh,
+                        "times_refreshed": token.times_refreshed + pending.count,
+                    }
+                )
+        return token
+
+    @classmethod
+    async def flush(cls) -> int:
+        """Write the buffered refreshes to the token store at once.
+
+        Returns:
+            int: The number of tokens updated.
+        """
+        if not cls._pending:
+            return 0
+        cls._flushing, cls._pending = cls._pending, {}
+        try:
+            await get_token_store().refresh(cls._flushing)
+        except BaseException:
+            for token_id, pending in cls._flushing.items():
+                newer = cls._pending.get(token_id)
+                if newer is not None:
+                    pending.valid_until = max(pending.valid_until, newer.valid_until)
+                    pending.last_refresh = newer.last_refresh
+                    pending.count += newer.count
+                cls._pending[token_id] = pending
+            raise
+        finally:
+            flushed = len(cls._flushing)
+            cls._flushing = {}
+        cls.flushes += 1
+        cls.flushed_refreshes += flushed
+        return flushed
+
+    @classmethod
+    def get_stats(cls) -> dict[str, int]:
+        """Get the buffer counters.
+
+        Returns:
+            dict[str, int]: The flushes, refreshes flushed and tokens pending.
+        """
+        return {
+            "flushes": cls.flushes,
+            "flushed_refreshes": cls.flushed_refreshes,
+            "pending": len(cls._pending) + len(cls._flushing),
+        }
+
+    @classmethod
+    def start(cls) -> None:
+        """Start the background task that flushes the buffer."""
+        if cls._task is None:
+            cls._stopping = False
+            cls._wake = asyncio.Event()
+            cls._task = asyncio.create_task(cls._run())
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Stop the background task and flush the pending refreshes.
+
+        The task is woken up instead of cancelled, so a flush in progress is
+        completed rather than interrupted.
+        """
+        if cls._task is not None:
+            cls._stopping = True
+            cls._wake.set()
+            await cls._task
+            cls._task = None
+            cls._wake = None
+        await cls.flush()
+
+    @classmethod
+    async def _run(cls) -> None:
+        """Flush the buffer on every interval or when it is full, until stopped."""
+        while not cls._stopping:
+            try:
+                await asyncio.wait_for(
+                    cls._wake.wait(), timeout=refresh_settings.REFRESH_FLUSH_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                pass
+            cls._wake.clear()
+            try:
+                await cls.flush()
+            except Exception:
+                logger.exception("Failed to flush the token refreshes, retrying.")
@@ -1,14 +1,23 @@
 """Util module for services."""
 
-import pytz
+import time
+import hashlib
 from uuid import UUID, uuid4
-from datetime import datetime, timezone
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from src.app.settings import entry_settings
 
 
 class UtilsService:
-    """Utils class for the other services."""
+    """Utils class for the other services.
+
+    The token times are UTC epoch seconds. They are only converted to
+    datetimes, in the APP_TIMEZONE, when presented.
+    """
 
-    __brazil_timezone = pytz.timezone("America/Sao_Paulo")
+    timezone = ZoneInfo(entry_settings.APP_TIMEZONE)
+    legacy_timezone = ZoneInfo("America/Sao_Paulo")
 
     @classmethod
     def create_uuid(cls) -> UUID:
@@ -19,14 +28,41 @@ class UtilsService:
         """
         return uuid4()
 
+    @classmethod
+    def get_signature_digest(cls, signature: str) -> bytes:
+        """Get the fixed-size digest of a jwt signature.
+
+        Args:
+            signature (str): The jwt signature.
+
+        Returns:
+            bytes: The SHA-256 digest of the signature.
+        """
+        return hashlib.sha256(signature.encode()).digest()
+
     @classmethod
     def get_current_datetime(cls) -> datetime:
-        """Get the current datetime from Brazil - São Paulo
+        """Get the current datetime in the application timezone.
 
         Returns:
             datetime: The current datetime.
         """
-        return datetime.now(cls.__brazil_timezone)
+        return datetime.now(cls.timezone)
+
+    @classmethod
+    def get_aware_datetime(cls, value: datetime) -> datetime:
+        """Get a datetime read from the database with its timezone.
+
+        Args:
+            value (datetime): The datetime, the naive ones in the application
+                wall time.
+
+        Returns:
+            datetime: The datetime in the application timezone.
+        """
+        if value.tzinfo is None:
+            return value.replace(tzinfo=cls.timezone)
+        return value.astimezone(cls.timezone)
 
     @classmethod
     def get_int_timestamp(cls, current: datetime = None) -> int:
@@ -36,21 +72,39 @@ class UtilsService:
             current (datetime): The current datetime, default is None.
 
         Returns:
-            int: The timestamp.
+            int: The UTC epoch seconds.
         """
         if current:
             return int(current.timestamp())
-        return int(cls.get_current_datetime().timestamp())
+        return int(time.time())
 
     @classmethod
     def get_timestamp_from_int(cls, timestamp: int) -> datetime:
         """Get a timestamp from int.
 
         Args:
-            timestamp (int): The timestamp.
+            timestamp (int): The UTC epoch seconds.
+
+        Returns:
+            datetime: The converted datetime, in the application timezone.
+        """
+        return datetime.fromtimestamp(timestamp, cls.timezone)
+
+    @classmethod
+    def get_int_timestamp_from_legacy(cls, value: datetime | str | int) -> int:
+        """Get the timestamp of a time stored before they were epoch seconds.
+
+        Args:
+            value (datetime | str | int): The stored time, the naive ones in
+                the America/Sao_Paulo wall time.
 
         Returns:
-            datetime: The converted datetime.
+            int: The UTC epoch seconds.
         """
-        utc_datetime = datetime.fromtimestamp(timestamp, timezone.utc)
-        return utc_datetime.astimezone(cls.__brazil_timezone)
+        if isinstance(value, int):
+            return value
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=cls.legacy_timezone)
+        return int(value.timestamp())
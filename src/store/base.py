@@ -0,0 +1,152 @@
+"""Module for the interface of the token stores."""
+
+from abc import ABC, abstractmethod
+from uuid import UUID
+from dataclasses import dataclass
+from typing import Collection
+
+from src.schema.auth import Jwt
+
+
+@dataclass(slots=True)
+class TokenRefresh:
+    """A merged set of refreshes of one token, to be saved."""
+
+    valid_until: int
+    last_refresh: int
+    count: int = 1
+
+
+@dataclass(slots=True)
+class TokenUse:
+    """A verification of a stored token, refreshing it if it is still valid.
+
+    The times are UTC epoch seconds.
+    """
+
+    token_id: UUID
+    signature: str
+    access_group: UUID
+    used_at: int
+    extend_before: int
+    extended_until: int
+
+    def is_valid(self, token: Jwt) -> bool:
+        """Check if a stored token matches the use and has not expired.
+
+        Args:
+            token (Jwt): The stored token.
+
+        Returns:
+            bool: True if the token can be used.
+        """
+        return (
+            token.signature == self.signature
+            and token.access_group == self.access_group
+            and token.valid_until >= self.used_at
+        )
+
+    def get_valid_until(self, valid_until: int) -> int:
+        """Get the refreshed expiration of a token.
+
+        Args:
+            valid_until (int): The current expiration.
+
+        Returns:
+            int: The extended expiration if it is before extend_before,
+                the current one otherwise.
+        """
+        if valid_until < self.extend_before:
+            return self.extended_until
+        return valid_until
+
+
+def merge_refresh(refreshes: dict[UUID, TokenRefresh], token: Jwt) -> None:
+    """Merge the refresh of a token into a set of refreshes.
+
+    Args:
+        refreshes (dict[UUID, TokenRefresh]): The refreshes, by token id.
+        token (Jwt): The refreshed token.
+    """
+    refresh = refreshes.get(token.id)
+    if refresh is None:
+        refreshes[token.id] = TokenRefresh(
+            valid_until=token.valid_until, last_refresh=token.last_refresh
+        )
+    else:
+        refresh.valid_until = max(refresh.valid_until, token.valid_until)
+        refresh.last_refresh = token.last_refresh
+        refresh.count += 1
+
+
+class TokenStore(ABC):
+    """Interface of the storages of the jwt tokens state."""
+
+    async def start(self) -> None:
+        """Start the store background work, if any."""
+
+    async def stop(self) -> None:
+        """Stop the store background work, if any."""
+
+    @abstractmethod
+    async def issue(self, tokens: list[Jwt]) -> None:
+        """Store new tokens.
+
+        Args:
+            tokens (list[Jwt]): The tokens issued.
+        """
+
+    @abstractmethod
+    async def lookup(self, token_ids: Collection[UUID]) -> dict[UUID, Jwt]:
+        """Find tokens by their id.
+
+        Args:
+            token_ids (Collection[UUID]): The token ids.
+
+        Returns:
+            dict[UUID, Jwt]: The tokens found, by id.
+        """
+
+    @abstractmethod
+    async def refresh(self, refreshes: dict[UUID, TokenRefresh]) -> None:
+        """Save token refreshes, incrementing the times refreshed.
+
+        Args:
+            refreshes (dict[UUID, TokenRefresh]): The refreshes, by token id.
+        """
+
+    @abstractmethod
+    async def use(self, token_use: TokenUse) -> Jwt | None:
+        """Verify a token and save its refresh atomically.
+
+        Args:
+            token_use (TokenUse): The token verification.
+
+        Returns:
+            Jwt | None: The refreshed token, None if it was not found, does not
+                match or has expired.
+        """
+
+    @abstractmethod
+    async def revoke(self, token_id: UUID, access_group: UUID) -> bool:
+        """Delete a token of an access group.
+
+        Args:
+            token_id (UUID): The token id.
+            access_group (UUID): The access group id.
+
+        Returns:
+            bool: True if the token was deleted, False if it was not found.
+        """
+
+    @abstractmethod
+    async def purge(self, expired_before: int, limit: int) -> int:
+        """Delete a chunk of expired tokens.
+
+        Args:
+            expired_before (int): Tokens valid until before it are deleted.
+            limit (int): The maximum number of tokens deleted.
+
+        Returns:
+            int: The number of tokens deleted.
+        """
@@ -0,0 +1,48 @@
+"""Module for selecting the token store backend."""
+
+from src.app.settings import StoreSettings, store_settings
+from src.store.base import TokenStore
+from src.store.memory import MemoryTokenStore
+from src.store.sql import SqlTokenStore
+
+_token_store: TokenStore | None = None
+
+
+def build_token_store(settings: StoreSettings) -> TokenStore:
+    """Create the token store configured in the settings.
+
+    Args:
+        settings (StoreSettings): The token store settings.
+
+    Returns:
+        TokenStore: The token store.
+    """
+    if settings.TOKEN_STORE == "memory":
+        return MemoryTokenStore(
+            shards=settings.TOKEN_STORE_SHARDS,
+            snapshot_path=settings.TOKEN_STORE_SNAPSHOT_PATH,
+            snapshot_interval=settings.TOKEN_STORE_SNAPSHOT_INTERVAL,
+        )
+    return SqlTokenStore()
+
+
+def get_token_store() -> TokenStore:
+    """Get the token store in use, creating it on first use.
+
+    Returns:
+        TokenStore: The token store.
+    """
+    global _token_store
+    if _token_store is None:
+        _token_store = build_token_store(store_settings)
+    return _token_store
+
+
+def set_token_store(token_store: TokenStore) -> None:
+    """Replace the token store in use.
+
+    Args:
+        token_store (TokenStore): The new token store.
+    """
+    global _token_store
+    _token_store = token_store
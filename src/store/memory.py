@@ -0,0 +1,243 @@
+"""Module for the sharded in-memory token store."""
+
+import os
+import json
+import asyncio
+import logging
+import threading
+from uuid import UUID
+from pathlib import Path
+from typing import Collection
+
+from src.schema.auth import Jwt
+from src.service.utils import UtilsService
+from src.store.base import TokenRefresh, TokenStore, TokenUse
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryTokenStore(TokenStore):
+    """Token store kept in the process memory, split in lock-striped shards.
+
+    Tokens are lost on restart unless a snapshot path is given, in which case
+    the store is periodically written to disk and loaded back on start. Each
+    worker process keeps its own store.
+    """
+
+    def __init__(
+        self,
+        shards: int = 16,
+        snapshot_path: str | None = None,
+        snapshot_interval: float = 60.0,
+    ) -> None:
+        """Constructor for the class.
+
+        Args:
+            shards (int): The number of shards.
+            snapshot_path (str | None): Where to write the snapshots, if any.
+            snapshot_interval (float): Seconds between snapshots.
+        """
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.snapshot_interval = snapshot_interval
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._shards: list[dict[UUID, Jwt]] = [{} for _ in range(shards)]
+        self._task: asyncio.Task | None = None
+
+    def _shard(self, token_id: UUID) -> int:
+        """Get the shard of a token.
+
+        Args:
+            token_id (UUID): The token id.
+
+        Returns:
+            int: The shard index.
+        """
+        return token_id.int % len(self._shards)
+
+    async def start(self) -> None:
+        """Load the last snapshot and start writing new ones."""
+        if self.snapshot_path is None:
+            return
+        if self.snapshot_path.exists():
+            await asyncio.to_thread(self._load_snapshot)
+        if self._task is None and self.snapshot_interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the snapshots, writing a last one."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.snapshot_path is not None:
+            await self.snapshot()
+
+    async def issue(self, tokens: list[Jwt]) -> None:
+        """Store new tokens.
+
+        Args:
+            tokens (list[Jwt]): The tokens issued.
+        """
+        for token in tokens:
+            index = self._shard(token.id)
+            with self._locks[index]:
+                self._shards[index][token.id] = token
+
+    async def lookup(self, token_ids: Collection[UUID]) -> dict[UUID, Jwt]:
+        """Find tokens by their id.
+
+        Args:
+            token_ids (Collection[UUID]): The token ids.
+
+        Returns:
+            dict[UUID, Jwt]: The tokens found, by id.
+        """
+        tokens = {}
+        for token_id in token_ids:
+            index = self._shard(token_id)
+            with self._locks[index]:
+                token = self._shards[index].get(token_id)
+            if token is not None:
+                tokens[token_id] = token
+        return tokens
+
+    async def refresh(self, refreshes: dict[UUID, TokenRefresh]) -> None:
+        """Save token refreshes.
+
+        Args:
+            refreshes (dict[UUID, TokenRefresh]): The refreshes, by token id.
+        """
+        for token_id, refresh in refreshes.items():
+            index = self._shard(token_id)
+            with self._locks[index]:
+                shard = self._shards[index]
+                token = shard.get(token_id)
+                if token is None:
+                    continue
+                shard[token_id] = token.model_copy(
+                    update={
+                        "valid_until": refresh.valid_until,
+                        "last_refresh": refresh.last_refresh,
+                        "times_refreshed": token.times_refreshed + refresh.count,
+                    }
+                )
+
+    async def use(self, token_use: TokenUse) -> Jwt | None:
+        """Verify a token and save its refresh, holding its shard lock.
+
+        Args:
+            token_use (TokenUse): The token verification.
+
+        Returns:
+            Jwt | None: The refreshed token, None if it was not found, does not
+                match or has expired.
+        """
+        index = self._shard(token_use.token_id)
+        with self._locks[index]:
+            shard = self._shards[index]
+            token = shard.get(token_use.token_id)
+            if token is None or not token_use.is_valid(token):
+                return None
+            token = shard[token.id] = token.model_copy(
+                update={
+                    "valid_until": token_use.get_valid_until(token.valid_until),
+                    "last_refresh": token_use.used_at,
+                    "times_refreshed": token.times_refreshed + 1,
+                }
+            )
+            return token
+
+    async def revoke(self, token_id: UUID, access_group: UUID) -> bool:
+        """Delete a token of an access group.
+
+        Args:
+            token_id (UUID): The token id.
+            access_group (UUID): The access group id.
+
+        Returns:
+            bool: True if the token was deleted, False if it was not found.
+        """
+        index = self._shard(token_id)
+        with self._locks[index]:
+            shard = self._shards[index]
+            token = shard.get(token_id)
+            if token is None or token.access_group != access_group:
+                return False
+            del shard[token_id]
+            return True
+
+    async def purge(self, expired_before: int, limit: int) -> int:
+        """Delete a chunk of expired tokens.
+
+        Args:
+            expired_before (int): Tokens valid until before it are deleted.
+            limit (int): The maximum number of tokens deleted.
+
+        Returns:
+            int: The number of tokens deleted.
+        """
+        purged = 0
+        for lock, shard in zip(self._locks, self._shards):
+            with lock:
+                expired = [
+                    token_id
+                    for token_id, token in shard.items()
+                    if token.valid_until < expired_before
+                ][: limit - purged]
+                for token_id in expired:
+                    del shard[token_id]
+            purged += len(expired)
+            if purged >= limit:
+                break
+        return purged
+
+    async def snapshot(self) -> None:
+        """Write all the tokens to the snapshot file."""
+        tokens = []
+        for lock, shard in zip(self._locks, self._shards):
+            with lock:
+                tokens.extend(shard.values())
+        await asyncio.to_thread(self._write_snapshot, tokens)
+
+    def _write_snapshot(self, tokens: list[Jwt]) -> None:
+        """Write tokens to the snapshot file, replacing it atomically.
+
+        Args:
+            tokens (list[Jwt]): The tokens to be written.
+        """
+        temporary = self.snapshot_path.with_suffix(".tmp")
+        with temporary.open("w") as file:
+            json.dump([token.model_dump(mode="json") for token in tokens], file)
+        os.replace(temporary, self.snapshot_path)
+
+    def _load_snapshot(self) -> None:
+        """Load the tokens from the snapshot file.
+
+        The times of the snapshots written before they were epoch seconds are
+        converted.
+        """
+        tokens = []
+        with self.snapshot_path.open() as file:
+            for token in json.load(file):
+                for name in ("valid_until", "date_created", "last_refresh"):
+                    if token.get(name) is not None:
+                        token[name] = UtilsService.get_int_timestamp_from_legacy(
+                            token[name]
+                        )
+                tokens.append(Jwt(**token))
+        for token in tokens:
+            index = self._shard(token.id)
+            with self._locks[index]:
+                self._shards[index][token.id] = token
+
+    async def _run(self) -> None:
+        """Write a snapshot on every interval."""
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            try:
+                await self.snapshot()
+            except Exception:
+                logger.exception("Failed to write the token store snapshot.")
@@ -0,0 +1,145 @@
+"""Module for the relational token store."""
+
+from uuid import UUID
+from typing import Collection
+from sqlalchemy import bindparam, case, select
+
+from src.database.database import Database
+from src.database.tables import jwts_table
+from src.schema.auth import Jwt
+from src.store.base import TokenRefresh, TokenStore, TokenUse
+
+
+class SqlTokenStore(TokenStore):
+    """Token store backed by the jwts table, through the Database class."""
+
+    query_refresh = (
+        jwts_table.update()
+        .where(jwts_table.c.id == bindparam("token_id"))
+        .values(
+            valid_until=bindparam("new_valid_until"),
+            last_refresh=bindparam("new_last_refresh"),
+            times_refreshed=jwts_table.c.times_refreshed + bindparam("count"),
+        )
+    )
+
+    async def issue(self, tokens: list[Jwt]) -> None:
+        """Store new tokens with a single multi-row insert.
+
+        Args:
+            tokens (list[Jwt]): The tokens issued.
+        """
+        await Database.execute_batch(
+            jwts_table.insert(), [token.model_dump() for token in tokens]
+        )
+
+    async def lookup(self, token_ids: Collection[UUID]) -> dict[UUID, Jwt]:
+        """Find tokens by their id, with one primary key query.
+
+        The rows are trusted, so the tokens are built without validation.
+
+        Args:
+            token_ids (Collection[UUID]): The token ids.
+
+        Returns:
+            dict[UUID, Jwt]: The tokens found, by id.
+        """
+        if not token_ids:
+            return {}
+        query = jwts_table.select().where(jwts_table.c.id.in_(token_ids))
+        rows = await Database.fetch_all(query)
+        return {row["id"]: Jwt.model_construct(**row) for row in rows}
+
+    async def refresh(self, refreshes: dict[UUID, TokenRefresh]) -> None:
+        """Save token refreshes in one transaction.
+
+        Args:
+            refreshes (dict[UUID, TokenRefresh]): The refreshes, by token id.
+        """
+        await Database.execute_batch(
+            self.query_refresh,
+            [
+                {
+                    "token_id": token_id,
+                    "new_valid_until": refresh.valid_until,
+                    "new_last_refresh": refresh.last_refresh,
+                    "count": refresh.count,
+                }
+                for token_id, refresh in refreshes.items()
+            ],
+        )
+
+    async def use(self, token_use: TokenUse) -> Jwt | None:
+        """Verify a token and save its refresh with one conditional update.
+
+        The update only matches the token if its signature and access group
+        are the given ones and it has not expired, so concurrent refreshes of
+        the same token are applied one after the other.
+
+        Args:
+            token_use (TokenUse): The token verification.
+
+        Returns:
+            Jwt | None: The refreshed token, None if it was not found, does not
+                match or has expired.
+        """
+        query = (
+            jwts_table.update()
+            .where(jwts_table.c.id == token_use.token_id)
+            .where(jwts_table.c.signature == token_use.signature)
+            .where(jwts_table.c.access_group == token_use.access_group)
+            .where(jwts_table.c.valid_until >= token_use.used_at)
+            .values(
+                valid_until=case(
+                    (
+                        jwts_table.c.valid_until < token_use.extend_before,
+                        token_use.extended_until,
+                    ),
+                    else_=jwts_table.c.valid_until,
+                ),
+                last_refresh=token_use.used_at,
+                times_refreshed=jwts_table.c.times_refreshed + 1,
+            )
+        )
+        fallback_query = jwts_table.select().where(
+            jwts_table.c.id == token_use.token_id
+        )
+        row = await Database.update_returning(query, fallback_query)
+        return Jwt.model_construct(**row) if row else None
+
+    async def revoke(self, token_id: UUID, access_group: UUID) -> bool:
+        """Delete a token of an access group.
+
+        Args:
+            token_id (UUID): The token id.
+            access_group (UUID): The access group id.
+
+        Returns:
+            bool: True if the token was deleted, False if it was not found.
+        """
+        query_delete = (
+            jwts_table.delete()
+            .where(jwts_table.c.id == token_id)
+            .where(jwts_table.c.access_group == access_group)
+        )
+        return await Database.execute(query_delete) > 0
+
+    async def purge(self, expired_before: int, limit: int) -> int:
+        """Delete a chunk of expired tokens, using the valid until index.
+
+        Args:
+            expired_before (int): Tokens valid until before it are deleted.
+            limit (int): The maximum number of tokens deleted.
+
+        Returns:
+            int: The number of tokens deleted.
+        """
+        chunk = (
+            select(jwts_table.c.id)
+            .where(jwts_table.c.valid_until < expired_before)
+            .limit(limit)
+            .scalar_subquery()
+        )
+        return await Database.execute(
+            jwts_table.delete().where(jwts_table.c.id.in_(chunk))
+        )
@@ -1,7 +1,10 @@
 """Module for testing access group routes."""
 
+import json
 import pytest
 from uuid import uuid4
+from freezegun import freeze_time
+from datetime import datetime, timedelta
 from fastapi import status
 from httpx import AsyncClient
 
@@ -9,8 +12,12 @@ from src.exceptions.access_groups import (
     EmailAlreadyInUseException,
     AccessGroupNotFoundException,
     AccessGroupIdUUIDException,
+    InvalidCursorException,
 )
 from src.schema.access_groups import AccessGroupResponse
+from src.service.access_groups import AccessGroupsService
+from src.service.rate_limit import LoginRateLimiter
+from src.service.utils import UtilsService
 
 
 @pytest.mark.asyncio
@@ -118,3 +125,133 @@ async def test_get_access_group_by_id_invalid_uuid(client: AsyncClient) -> None:
 
     assert response.status_code == AccessGroupIdUUIDException.STATUS_CODE
     assert response.json()["detail"] == AccessGroupIdUUIDException.DETAIL
+
+
+@pytest.mark.asyncio
+async def test_get_all_access_groups_paginated(client: AsyncClient) -> None:
+    """Test following the cursors of the access groups pages.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+    """
+    created = set()
+    for index in range(3):
+        data = {
+            "name": f"Test Page Access Group {index}",
+            "email": f"accessgrouppage{index}@example.com",
+            "password": "securepassword123",
+        }
+        response = await client.post("/access-groups/", json=data)
+        assert response.status_code == status.HTTP_201_CREATED
+        created.add(response.json()["id"])
+
+    retrieved = []
+    params = {"limit": 2}
+    while True:
+        response = await client.get("/access-groups/", params=params)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()) <= 2
+        retrieved.extend(group["id"] for group in response.json())
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if next_cursor is None:
+            break
+        params["cursor"] = next_cursor
+
+    assert len(retrieved) == len(set(retrieved))
+    assert created <= set(retrieved)
+
+    response = await client.get("/access-groups/", params={"stream": True})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    streamed = [json.loads(line)["id"] for line in response.text.splitlines()]
+    assert streamed == retrieved
+
+
+@pytest.mark.asyncio
+async def test_get_all_access_groups_invalid_cursor(client: AsyncClient) -> None:
+    """Test retrieving the access groups with an invalid cursor.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+    """
+    response = await client.get("/access-groups/", params={"cursor": "invalid"})
+
+    assert response.status_code == InvalidCursorException.STATUS_CODE
+    assert response.json()["detail"] == InvalidCursorException.DETAIL
+
+
+@pytest.mark.asyncio
+async def test_access_group_cache(client: AsyncClient) -> None:
+    """Test that the access groups are read by id and email from the cache.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+    """
+    data = {
+        "name": "Test Cached Group",
+        "email": "cached-group@example.com",
+        "password": "securepassword123",
+    }
+    response = await client.post("/access-groups/", json=data)
+    assert response.status_code == status.HTTP_201_CREATED
+    created = response.json()
+    group_id = created["id"]
+    cache = AccessGroupsService.group_cache
+    date_created = datetime.fromisoformat(created["date_created"])
+    assert date_created.utcoffset() == UtilsService.get_current_datetime().utcoffset()
+
+    hits = cache.hits
+    response = await client.get("/access-groups/by-id", params={"id": group_id})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == created
+    assert "password" not in response.json()
+    jwt_request = {"email": data["email"], "password": data["password"]}
+    response = await client.post("/auth/", json=jwt_request)
+    assert response.status_code == status.HTTP_201_CREATED
+    assert cache.hits == hits + 2
+
+    cache.clear()
+    misses = cache.misses
+    response = await client.get("/access-groups/by-id", params={"id": group_id})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == created
+    response = await client.post("/auth/", json=jwt_request)
+    assert response.status_code == status.HTTP_201_CREATED
+    assert cache.misses == misses + 1
+
+    response = await client.get("/access-groups/", params={"stream": True})
+    streamed = [json.loads(line) for line in response.text.splitlines()]
+    assert created in streamed
+
+
+@pytest.mark.asyncio
+async def test_access_group_cache_unknown_email(client: AsyncClient) -> None:
+    """Test that unknown emails are cached briefly and replaced on create.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+    """
+    data = {
+        "name": "Test Unknown Email",
+        "email": "unknown-email@example.com",
+        "password": "securepassword123",
+    }
+    jwt_request = {"email": data["email"], "password": data["password"]}
+    cache = AccessGroupsService.group_cache
+
+    with freeze_time() as frozen_time:
+        response = await client.post("/auth/", json=jwt_request)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert cache.get(("email", data["email"])) is False
+
+        frozen_time.tick(timedelta(seconds=10))
+        assert cache.get(("email", data["email"])) is None
+    LoginRateLimiter.clear()
+
+    response = await client.post("/auth/", json=jwt_request)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert cache.get(("email", data["email"])) is False
+    response = await client.post("/access-groups/", json=data)
+    assert response.status_code == status.HTTP_201_CREATED
+    response = await client.post("/auth/", json=jwt_request)
+    assert response.status_code == status.HTTP_201_CREATED
@@ -0,0 +1,30 @@
+"""Conftest module running the auth tests against every token store backend."""
+
+import pytest_asyncio
+
+from src.app.settings import StoreSettings
+from src.database.database import Database
+from src.service.auth import AuthService
+from src.store.base import TokenStore
+from src.store.factory import build_token_store, get_token_store, set_token_store
+
+
+@pytest_asyncio.fixture(scope="module", params=["sql", "memory"], autouse=True)
+async def token_store(request) -> TokenStore:
+    """Fixture to run the module tests against each token store, on a fresh database.
+
+    Args:
+        request (): The pytest request, with the backend as parameter.
+
+    Yields:
+        TokenStore: The token store under test.
+    """
+    await Database.drop_models()
+    await Database.init_models()
+    AuthService.token_cache.clear()
+    previous = get_token_store()
+    store = build_token_store(StoreSettings(TOKEN_STORE=request.param))
+    set_token_store(store)
+    yield store
+    set_token_store(previous)
+    AuthService.token_cache.clear()
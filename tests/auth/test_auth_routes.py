@@ -1,14 +1,33 @@
 """Module for testing auth routes."""
 
 import pytest
+import asyncio
+from uuid import uuid4
+from dataclasses import replace
 from fastapi import status
 from httpx import AsyncClient
 from freezegun import freeze_time
 from datetime import timedelta
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+from sqlalchemy import select
 
+from src.app.settings import jwt_settings, login_limit_settings, refresh_settings
+from src.database.database import Database
+from src.database.tables import access_groups_table
 from src.exceptions.access_groups import InvalidCredentialsException
-from src.exceptions.auth import ExpiredTokenException, InvalidTokenException
+from src.exceptions.auth import (
+    ExpiredTokenException,
+    InvalidTokenException,
+    TooManyLoginAttemptsException,
+)
 from src.schema.auth import JwtResponse
+from src.schema.passw import PasswordHandler
+from src.service.auth import AuthService
+from src.service.rate_limit import LoginRateLimiter, TokenBucketLimiter
+from src.service.refresh_buffer import RefreshBuffer
+from src.service.utils import UtilsService
+from src.store.base import TokenStore, TokenUse
 
 
 @pytest.mark.asyncio
@@ -131,3 +150,638 @@ async def test_use_jwt_with_expired_token(client: AsyncClient) -> None:
         response_fail = await client.put("/auth/", json=verify_data)
         assert response_fail.status_code == ExpiredTokenException.STATUS_CODE
         assert response_fail.json()["detail"] == ExpiredTokenException.DETAIL
+
+
+@pytest.mark.asyncio
+async def test_jwt_minimal_claims(client: AsyncClient) -> None:
+    """Test that tokens only carry the registered claims, bound to their group.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+    """
+    jwt_request = {"email": "use-jwt@example.com", "password": "securepassword123"}
+    jwt_response = await client.post("/auth/", json=jwt_request)
+    assert jwt_response.status_code == status.HTTP_201_CREATED
+    jwt = JwtResponse(**jwt_response.json())
+
+    payload = await AuthService.decode_jwt(jwt.signature)
+    assert set(payload) == {"sub", "exp", "iat", "jti"}
+    assert payload["sub"] == jwt.access_group
+    assert payload["jti"] == jwt.id
+
+    verify_data = {"access_group": str(uuid4()), "signature": jwt.signature}
+    response = await client.put("/auth/", json=verify_data)
+    assert response.status_code == InvalidTokenException.STATUS_CODE
+
+
+@pytest.mark.asyncio
+async def test_revoke_jwt(client: AsyncClient) -> None:
+    """Test revoking a JWT token.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+    """
+    jwt_request = {"email": "use-jwt@example.com", "password": "securepassword123"}
+    jwt_response = await client.post("/auth/", json=jwt_request)
+    assert jwt_response.status_code == status.HTTP_201_CREATED
+    jwt = JwtResponse(**jwt_response.json())
+
+    verify_data = {"access_group": str(jwt.access_group), "signature": jwt.signature}
+    response = await client.post("/auth/revoke", json=verify_data)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    response = await client.put("/auth/", json=verify_data)
+    assert response.status_code == InvalidTokenException.STATUS_CODE
+
+    response = await client.post("/auth/revoke", json=verify_data)
+    assert response.status_code == InvalidTokenException.STATUS_CODE
+
+
+@pytest.mark.asyncio
+async def test_use_jwt_rejected_before_database(
+    client: AsyncClient, token_store: TokenStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that tampered and stale tokens are rejected without a store lookup.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+        token_store (TokenStore): The token store under test.
+        monkeypatch (pytest.MonkeyPatch): Fixture to patch the token store.
+    """
+    jwt_request = {"email": "use-jwt@example.com", "password": "securepassword123"}
+    jwt_response = await client.post("/auth/", json=jwt_request)
+    assert jwt_response.status_code == status.HTTP_201_CREATED
+    jwt = JwtResponse(**jwt_response.json())
+
+    async def fail_lookup(token_ids) -> None:
+        raise AssertionError("The token store should not be queried.")
+
+    monkeypatch.setattr(token_store, "lookup", fail_lookup)
+
+    header, payload, signature = jwt.signature.split(".")
+    tampered = f"{header}.{payload}.{signature[::-1]}"
+    verify_data = {"access_group": str(jwt.access_group), "signature": tampered}
+    response = await client.put("/auth/", json=verify_data)
+    assert response.status_code == InvalidTokenException.STATUS_CODE
+
+    with freeze_time() as frozen_time:
+        frozen_time.move_to(
+            jwt.valid_until + timedelta(seconds=jwt_settings.JWT_MAX_REFRESH_TIME + 5)
+        )
+        verify_data["signature"] = jwt.signature
+        response = await client.put("/auth/", json=verify_data)
+        assert response.status_code == ExpiredTokenException.STATUS_CODE
+
+
+@pytest.mark.asyncio
+async def test_use_jwt_from_cache(
+    client: AsyncClient, token_store: TokenStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that repeated verifications are answered from the token cache.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+        token_store (TokenStore): The token store under test.
+        monkeypatch (pytest.MonkeyPatch): Fixture to patch the token store.
+    """
+    monkeypatch.setattr(refresh_settings, "REFRESH_WRITE_BEHIND", True)
+    jwt_request = {"email": "use-jwt@example.com", "password": "securepassword123"}
+    jwt_response = await client.post("/auth/", json=jwt_request)
+    assert jwt_response.status_code == status.HTTP_201_CREATED
+    jwt = JwtResponse(**jwt_response.json())
+
+    verify_data = {"access_group": str(jwt.access_group), "signature": jwt.signature}
+    response = await client.put("/auth/", json=verify_data)
+    assert response.status_code == status.HTTP_200_OK
+
+    async def fail_lookup(token_ids) -> None:
+        raise AssertionError("The token store should not be queried.")
+
+    monkeypatch.setattr(token_store, "lookup", fail_lookup)
+    hits = AuthService.token_cache.hits
+
+    response = await client.put("/auth/", json=verify_data)
+    assert response.status_code == status.HTTP_200_OK
+    assert AuthService.token_cache.hits == hits + 1
+
+
+@pytest.mark.asyncio
+async def test_use_jwt_revoked_elsewhere(
+    client: AsyncClient, token_store: TokenStore
+) -> None:
+    """Test that a token deleted behind the cache is rejected without write-behind.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+        token_store (TokenStore): The token store under test.
+    """
+    group_data = {
+        "name": "Test Revoked Elsewhere",
+        "email": "revoked-elsewhere@example.com",
+        "password": "securepassword123",
+    }
+    await client.post("/access-groups/", json=group_data)
+    jwt_request = {"email": group_data["email"], "password": group_data["password"]}
+    jwt_response = await client.post("/auth/", json=jwt_request)
+    assert jwt_response.status_code == status.HTTP_201_CREATED
+    jwt = JwtResponse(**jwt_response.json())
+
+    verify_data = {"access_group": str(jwt.access_group), "signature": jwt.signature}
+    response = await client.put("/auth/", json=verify_data)
+    assert response.status_code == status.HTTP_200_OK
+
+    # As another worker would, without touching the cache of this one
+    assert await token_store.revoke(jwt.id, jwt.access_group)
+    response = await client.put("/auth/", json=verify_data)
+    assert response.status_code == InvalidTokenException.STATUS_CODE
+    response = await client.put("/auth/batch", json={"tokens": [verify_data]})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()[0]["valid"] is False
+
+
+@pytest.mark.asyncio
+async def test_use_jwt_with_write_behind(
+    client: AsyncClient, token_store: TokenStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that buffered refreshes are merged and written in one flush.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+        token_store (TokenStore): The token store under test.
+        monkeypatch (pytest.MonkeyPatch): Fixture to patch the settings.
+    """
+    monkeypatch.setattr(refresh_settings, "REFRESH_WRITE_BEHIND", True)
+    jwt_request = {"email": "use-jwt@example.com", "password": "securepassword123"}
+    jwt_response = await client.post("/auth/", json=jwt_request)
+    assert jwt_response.status_code == status.HTTP_201_CREATED
+    jwt = JwtResponse(**jwt_response.json())
+
+    verify_data = {"access_group": str(jwt.access_group), "signature": jwt.signature}
+    for _ in range(2):
+        response = await client.put("/auth/", json=verify_data)
+        assert response.status_code == status.HTTP_200_OK
+
+    stored = await token_store.lookup([jwt.id])
+    assert stored[jwt.id].times_refreshed == 0
+
+    assert await RefreshBuffer.flush() == 1
+    stored = await token_store.lookup([jwt.id])
+    assert stored[jwt.id].times_refreshed == 2
+
+
+@pytest.mark.asyncio
+async def test_write_behind_stop_during_flush(
+    client: AsyncClient, token_store: TokenStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that stopping the buffer completes the flush in progress.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+        token_store (TokenStore): The token store under test.
+        monkeypatch (pytest.MonkeyPatch): Fixture to patch the settings and store.
+    """
+    monkeypatch.setattr(refresh_settings, "REFRESH_WRITE_BEHIND", True)
+    monkeypatch.setattr(refresh_settings, "REFRESH_FLUSH_SIZE", 1)
+    group_data = {
+        "name": "Test Write Behind Stop",
+        "email": "write-behind-stop@example.com",
+        "password": "securepassword123",
+    }
+    await client.post("/access-groups/", json=group_data)
+    jwt_request = {"email": group_data["email"], "password": group_data["password"]}
+    jwt_response = await client.post("/auth/", json=jwt_request)
+    assert jwt_response.status_code == status.HTTP_201_CREATED
+    jwt = JwtResponse(**jwt_response.json())
+
+    refresh = token_store.refresh
+    flushing = asyncio.Event()
+
+    async def slow_refresh(refreshes) -> None:
+        flushing.set()
+        await asyncio.sleep(0.1)
+        await refresh(refreshes)
+
+    monkeypatch.setattr(token_store, "refresh", slow_refresh)
+    RefreshBuffer.start()
+    try:
+        verify_data = {
+            "access_group": str(jwt.access_group),
+            "signature": jwt.signature,
+        }
+        response = await client.put("/auth/", json=verify_data)
+        assert response.status_code == status.HTTP_200_OK
+        await asyncio.wait_for(flushing.wait(), timeout=1)
+    finally:
+        await RefreshBuffer.stop()
+
+    assert RefreshBuffer.get_stats()["pending"] == 0
+    stored = await token_store.lookup([jwt.id])
+    assert stored[jwt.id].times_refreshed == 1
+
+
+@pytest.mark.asyncio
+async def test_create_jwt_batch(client: AsyncClient) -> None:
+    """Test creating many JWT tokens in one request.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+    """
+    request_data = {
+        "email": "use-jwt@example.com",
+        "password": "securepassword123",
+        "count": 5,
+    }
+    response = await client.post("/auth/batch", json=request_data)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    tokens = [JwtResponse(**token) for token in response.json()]
+    assert len(tokens) == 5
+    assert len({token.signature for token in tokens}) == 5
+
+    verify_data = {
+        "access_group": str(tokens[-1].access_group),
+        "signature": tokens[-1].signature,
+    }
+    response = await client.put("/auth/", json=verify_data)
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.asyncio
+async def test_create_jwt_batch_invalid(client: AsyncClient) -> None:
+    """Test creating a batch of JWT tokens with invalid data.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+    """
+    request_data = {
+        "email": "use-jwt@example.com",
+        "password": "securepassword124",
+        "count": 5,
+    }
+    response = await client.post("/auth/batch", json=request_data)
+    assert response.status_code == InvalidCredentialsException.STATUS_CODE
+
+    request_data["count"] = jwt_settings.JWT_BATCH_MAX_SIZE + 1
+    response = await client.post("/auth/batch", json=request_data)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
+@pytest.mark.asyncio
+async def test_use_jwt_batch(client: AsyncClient, token_store: TokenStore) -> None:
+    """Test verifying many JWT tokens in one request.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+        token_store (TokenStore): The token store under test.
+    """
+    request_data = {
+        "email": "use-jwt@example.com",
+        "password": "securepassword123",
+        "count": 2,
+    }
+    response = await client.post("/auth/batch", json=request_data)
+    assert response.status_code == status.HTTP_201_CREATED
+    tokens = [JwtResponse(**token) for token in response.json()]
+    access_group = str(tokens[0].access_group)
+
+    verify_data = {
+        "tokens": [
+            {"access_group": access_group, "signature": tokens[0].signature},
+            {"access_group": access_group, "signature": tokens[1].signature},
+            {"access_group": access_group, "signature": tokens[0].signature},
+            {"access_group": access_group, "signature": "invalidsignature"},
+            {"access_group": str(uuid4()), "signature": tokens[1].signature},
+        ]
+    }
+    response = await client.put("/auth/batch", json=verify_data)
+    assert response.status_code == status.HTTP_200_OK
+
+    results = response.json()
+    assert [result["valid"] for result in results] == [True, True, True, False, False]
+    assert results[0]["token"]["id"] == str(tokens[0].id)
+    assert results[3]["detail"] == InvalidTokenException.DETAIL
+    assert results[4]["detail"] == InvalidTokenException.DETAIL
+
+    stored = await token_store.lookup([tokens[0].id])
+    assert stored[tokens[0].id].times_refreshed == 2
+
+
+@pytest.mark.asyncio
+async def test_use_jwt_batch_in_store(
+    client: AsyncClient, token_store: TokenStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a batch is verified with the conditional updates of the store.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+        token_store (TokenStore): The token store under test.
+        monkeypatch (pytest.MonkeyPatch): Fixture to patch the token store.
+    """
+    group_data = {
+        "name": "Test Batch In Store",
+        "email": "batch-in-store@example.com",
+        "password": "securepassword123",
+    }
+    await client.post("/access-groups/", json=group_data)
+    request_data = {
+        "email": group_data["email"],
+        "password": group_data["password"],
+        "count": 2,
+    }
+    response = await client.post("/auth/batch", json=request_data)
+    assert response.status_code == status.HTTP_201_CREATED
+    tokens = [JwtResponse(**token) for token in response.json()]
+    verify_data = {
+        "tokens": [
+            {"access_group": str(token.access_group), "signature": token.signature}
+            for token in tokens
+        ]
+    }
+
+    async def fail_lookup(token_ids) -> None:
+        raise AssertionError("The token store should not be queried.")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(token_store, "lookup", fail_lookup)
+        response = await client.put("/auth/batch", json=verify_data)
+    results = response.json()
+    assert [result["valid"] for result in results] == [True, True]
+    valid_until = JwtResponse(**results[0]["token"]).valid_until
+
+    # Revoked and expired after being verified, as another worker would
+    assert await token_store.revoke(tokens[1].id, tokens[1].access_group)
+    with freeze_time(valid_until + timedelta(seconds=5)):
+        response = await client.put("/auth/batch", json=verify_data)
+    assert [result["detail"] for result in response.json()] == [
+        ExpiredTokenException.DETAIL,
+        InvalidTokenException.DETAIL,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_create_jwt_rehashes_password(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that logging in rehashes a password with outdated cost parameters.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+        monkeypatch (pytest.MonkeyPatch): Fixture to patch the hasher.
+    """
+    group_data = {
+        "name": "Test Rehash",
+        "email": "rehash@example.com",
+        "password": "securepassword123",
+    }
+    group_response = await client.post("/access-groups/", json=group_data)
+    assert group_response.status_code == status.HTTP_201_CREATED
+
+    monkeypatch.setattr(
+        PasswordHandler,
+        "password_hasher",
+        PasswordHash((Argon2Hasher(time_cost=1, memory_cost=8192, parallelism=1),)),
+    )
+    jwt_request = {"email": group_data["email"], "password": group_data["password"]}
+    for _ in range(2):
+        response = await client.post("/auth/", json=jwt_request)
+        assert response.status_code == status.HTTP_201_CREATED
+
+    query = select(access_groups_table.c.password).where(
+        access_groups_table.c.email == group_data["email"]
+    )
+    row = await Database.fetch_one(query)
+    assert "m=8192,t=1,p=1" in row["password"]
+
+
+@pytest.mark.asyncio
+async def test_create_jwt_rate_limited(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that login attempts over the email limit are rejected.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+        monkeypatch (pytest.MonkeyPatch): Fixture to patch the limiter.
+    """
+    monkeypatch.setattr(
+        LoginRateLimiter,
+        "by_email",
+        TokenBucketLimiter(burst=2, refill=0.1, max_keys=10),
+    )
+    jwt_request = {"email": "use-jwt@example.com", "password": "wrongpassword"}
+    for _ in range(2):
+        response = await client.post("/auth/", json=jwt_request)
+        assert response.status_code == InvalidCredentialsException.STATUS_CODE
+
+    jwt_request["password"] = "securepassword123"
+    response = await client.post("/auth/batch", json={**jwt_request, "count": 1})
+    assert response.status_code == TooManyLoginAttemptsException.STATUS_CODE
+    assert response.headers["Retry-After"] == "10"
+
+    response = await client.post(
+        "/auth/", json={"email": "other@example.com", "password": "wrongpassword"}
+    )
+    assert response.status_code == InvalidCredentialsException.STATUS_CODE
+    assert LoginRateLimiter.get_stats()["email"]["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_create_jwt_rate_limit_counts_failures(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that only the failed logins count against the email limit.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+        monkeypatch (pytest.MonkeyPatch): Fixture to patch the limiter.
+    """
+    group_data = {
+        "name": "Test Rate Limit Failures",
+        "email": "rate-limit-failures@example.com",
+        "password": "securepassword123",
+    }
+    await client.post("/access-groups/", json=group_data)
+    monkeypatch.setattr(
+        LoginRateLimiter,
+        "by_email",
+        TokenBucketLimiter(burst=2, refill=0.1, max_keys=10),
+    )
+    jwt_request = {"email": group_data["email"], "password": group_data["password"]}
+    for _ in range(3):
+        response = await client.post("/auth/", json=jwt_request)
+        assert response.status_code == status.HTTP_201_CREATED
+
+    response = await client.post("/auth/", json={**jwt_request, "password": "wrong"})
+    assert response.status_code == InvalidCredentialsException.STATUS_CODE
+    response = await client.post("/auth/batch", json={**jwt_request, "count": 1})
+    assert response.status_code == status.HTTP_201_CREATED
+    response = await client.post("/auth/", json={**jwt_request, "password": "wrong"})
+    assert response.status_code == InvalidCredentialsException.STATUS_CODE
+    response = await client.post("/auth/", json=jwt_request)
+    assert response.status_code == TooManyLoginAttemptsException.STATUS_CODE
+
+
+@pytest.mark.asyncio
+async def test_create_jwt_rate_limit_client_header(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the client limit reads the address set by the proxy.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+        monkeypatch (pytest.MonkeyPatch): Fixture to patch the limiter.
+    """
+    monkeypatch.setattr(
+        LoginRateLimiter,
+        "by_client",
+        TokenBucketLimiter(burst=1, refill=0.1, max_keys=10),
+    )
+    monkeypatch.setattr(
+        login_limit_settings, "LOGIN_LIMIT_CLIENT_HEADER", "X-Forwarded-For"
+    )
+    jwt_request = {"email": "invalid@example.com", "password": "wrongpassword"}
+    for address in ["10.0.0.1", "1.2.3.4, 10.0.0.2"]:
+        response = await client.post(
+            "/auth/", json=jwt_request, headers={"X-Forwarded-For": address}
+        )
+        assert response.status_code == InvalidCredentialsException.STATUS_CODE
+
+    response = await client.post(
+        "/auth/", json=jwt_request, headers={"X-Forwarded-For": "5.6.7.8, 10.0.0.1"}
+    )
+    assert response.status_code == TooManyLoginAttemptsException.STATUS_CODE
+
+
+@pytest.mark.asyncio
+async def test_use_jwt_response_matches_schema(client: AsyncClient) -> None:
+    """Test that the responses built without validation match the schema.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+    """
+    group_data = {
+        "name": "Test Response Schema",
+        "email": "response-schema@example.com",
+        "password": "securepassword123",
+    }
+    await client.post("/access-groups/", json=group_data)
+
+    jwt_request = {"email": group_data["email"], "password": group_data["password"]}
+    jwt_response = await client.post("/auth/", json=jwt_request)
+    assert jwt_response.status_code == status.HTTP_201_CREATED
+    jwt = JwtResponse(**jwt_response.json())
+
+    verify_data = {"access_group": str(jwt.access_group), "signature": jwt.signature}
+    response = await client.put("/auth/", json=verify_data)
+    assert response.status_code == status.HTTP_200_OK
+    assert set(response.json()) == set(JwtResponse.model_fields)
+    verified = JwtResponse(**response.json())
+    assert (verified.id, verified.access_group, verified.signature) == (
+        jwt.id,
+        jwt.access_group,
+        jwt.signature,
+    )
+
+
+@pytest.mark.asyncio
+async def test_use_jwt_refresh_window(
+    client: AsyncClient, token_store: TokenStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that every use is one conditional update, extending the token only
+    in its last minute.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+        token_store (TokenStore): The token store under test.
+        monkeypatch (pytest.MonkeyPatch): Fixture to patch the settings and store.
+    """
+    monkeypatch.setattr(jwt_settings, "JWT_VALID_TIME", 120)
+    group_data = {
+        "name": "Test Refresh Window",
+        "email": "refresh-window@example.com",
+        "password": "securepassword123",
+    }
+    await client.post("/access-groups/", json=group_data)
+    jwt_request = {"email": group_data["email"], "password": group_data["password"]}
+    jwt_response = await client.post("/auth/", json=jwt_request)
+    assert jwt_response.status_code == status.HTTP_201_CREATED
+    jwt = JwtResponse(**jwt_response.json())
+    verify_data = {"access_group": str(jwt.access_group), "signature": jwt.signature}
+
+    async def fail_lookup(token_ids) -> None:
+        raise AssertionError("The token store should not be queried.")
+
+    use = token_store.use
+    uses = []
+
+    async def count_use(token_use: TokenUse):
+        uses.append(token_use)
+        return await use(token_use)
+
+    monkeypatch.setattr(token_store, "lookup", fail_lookup)
+    monkeypatch.setattr(token_store, "use", count_use)
+
+    response = await client.put("/auth/", json=verify_data)
+    assert response.status_code == status.HTTP_200_OK
+    assert JwtResponse(**response.json()).valid_until == jwt.valid_until
+
+    with freeze_time(jwt.valid_until - timedelta(seconds=30)):
+        response = await client.put("/auth/", json=verify_data)
+        assert response.status_code == status.HTTP_200_OK
+
+    assert len(uses) == 2
+    assert JwtResponse(**response.json()).valid_until == jwt.valid_until + timedelta(
+        seconds=30
+    )
+    monkeypatch.undo()
+    stored = (await token_store.lookup([jwt.id]))[jwt.id]
+    assert stored.times_refreshed == 2
+
+
+@pytest.mark.asyncio
+async def test_use_jwt_in_store(
+    client: AsyncClient, token_store: TokenStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a token is verified and refreshed in a single store operation.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+        token_store (TokenStore): The token store under test.
+        monkeypatch (pytest.MonkeyPatch): Fixture to disable RETURNING.
+    """
+    group_data = {
+        "name": "Test Use In Store",
+        "email": "use-in-store@example.com",
+        "password": "securepassword123",
+    }
+    await client.post("/access-groups/", json=group_data)
+    jwt_request = {"email": group_data["email"], "password": group_data["password"]}
+    jwt_response = await client.post("/auth/", json=jwt_request)
+    assert jwt_response.status_code == status.HTTP_201_CREATED
+    jwt = JwtResponse(**jwt_response.json())
+
+    valid_until = UtilsService.get_int_timestamp(jwt.valid_until)
+    token_use = TokenUse(
+        token_id=jwt.id,
+        signature=jwt.signature,
+        access_group=jwt.access_group,
+        used_at=UtilsService.get_int_timestamp(),
+        extend_before=valid_until + 1,
+        extended_until=valid_until + 60,
+    )
+    unusable = [
+        replace(token_use, signature="invalid.signature"),
+        replace(token_use, access_group=uuid4()),
+        replace(token_use, used_at=valid_until + 1),
+    ]
+    for use in unusable:
+        assert await token_store.use(use) is None
+
+    tokens = await asyncio.gather(*(token_store.use(token_use) for _ in range(3)))
+    monkeypatch.setattr(Database.engine.dialect, "update_returning", False)
+    tokens += await asyncio.gather(*(token_store.use(token_use) for _ in range(2)))
+
+    assert sorted(token.times_refreshed for token in tokens) == [1, 2, 3, 4, 5]
+    stored = (await token_store.lookup([jwt.id]))[jwt.id]
+    assert stored.times_refreshed == 5
+    assert stored.valid_until == token_use.extended_until
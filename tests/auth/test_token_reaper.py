@@ -0,0 +1,59 @@
+"""Module for testing the expired tokens reaper."""
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from freezegun import freeze_time
+from datetime import timedelta
+
+from src.app.settings import reaper_settings
+from src.schema.auth import JwtResponse
+from src.service.reaper import TokenReaper
+from src.store.base import TokenStore
+
+
+@pytest.mark.asyncio
+async def test_reap_expired_tokens(
+    client: AsyncClient, token_store: TokenStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that tokens expired past the grace period are deleted in chunks.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+        token_store (TokenStore): The token store under test.
+        monkeypatch (pytest.MonkeyPatch): Fixture to patch the settings.
+    """
+    monkeypatch.setattr(reaper_settings, "REAPER_CHUNK_SIZE", 1)
+    monkeypatch.setattr(reaper_settings, "REAPER_CHUNK_PAUSE", 0)
+    group_data = {
+        "name": "Test Reaper",
+        "email": "reaper@example.com",
+        "password": "securepassword123",
+    }
+    group_response = await client.post("/access-groups/", json=group_data)
+    assert group_response.status_code == status.HTTP_201_CREATED
+
+    jwt_request = {"email": group_data["email"], "password": group_data["password"]}
+    tokens = []
+    for _ in range(2):
+        jwt_response = await client.post("/auth/", json=jwt_request)
+        assert jwt_response.status_code == status.HTTP_201_CREATED
+        tokens.append(JwtResponse(**jwt_response.json()))
+
+    # The background task would also wake up when the time is moved forward
+    await TokenReaper.stop()
+    rows_reaped = TokenReaper.rows_reaped
+    token_ids = [token.id for token in tokens]
+
+    assert await TokenReaper.reap() == 0
+    assert len(await token_store.lookup(token_ids)) == 2
+
+    with freeze_time() as frozen_time:
+        frozen_time.move_to(
+            tokens[-1].valid_until
+            + timedelta(seconds=reaper_settings.REAPER_GRACE_PERIOD + 5)
+        )
+        assert await TokenReaper.reap() >= 2
+
+    assert await token_store.lookup(token_ids) == {}
+    assert TokenReaper.rows_reaped >= rows_reaped + 2
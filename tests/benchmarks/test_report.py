@@ -0,0 +1,42 @@
+"""Module for testing the benchmark reports."""
+
+from benchmarks.report import check_budget, compare, percentile, summarize
+
+
+def test_summarize() -> None:
+    """Test the throughput and latency percentiles of a run."""
+    latencies = [index / 1000 for index in range(100, 0, -1)]
+
+    assert percentile(sorted(latencies), 0.5) == 0.05
+    assert summarize(latencies, elapsed=2.0, cpu=0.5) == {
+        "requests": 100,
+        "throughput": 50.0,
+        "p50_ms": 50.0,
+        "p99_ms": 99.0,
+        "cpu_ms": 5.0,
+    }
+
+
+def test_compare_with_baseline() -> None:
+    """Test that only changes over the threshold are regressions."""
+    case = {"scenario": "verify", "table_size": 0, "concurrency": 8}
+    baseline = [{**case, "throughput": 1000.0, "p99_ms": 10.0, "cpu_ms": 1.0}]
+
+    within = [{**case, "throughput": 900.0, "p99_ms": 11.0, "cpu_ms": 1.1}]
+    assert compare(within, baseline, threshold=0.2) == []
+
+    slower = [{**case, "throughput": 700.0, "p99_ms": 13.0, "cpu_ms": 1.5, "errors": 1}]
+    assert len(compare(slower, baseline, threshold=0.2)) == 4
+
+    unknown = [{**slower[0], "concurrency": 64}]
+    assert compare(unknown, baseline, threshold=0.2) == []
+
+
+def test_check_budget() -> None:
+    """Test that only the times over the budget are reported."""
+    budget = {"import_ms": 1000.0, "first_request_ms": 1200.0}
+
+    assert check_budget({"import_ms": 900.0, "first_request_ms": 1200.0}, budget) == []
+    assert check_budget({"import_ms": 1100.0, "first_request_ms": 1000.0}, budget) == [
+        "import_ms: 1100.0ms, budget 1000.0ms"
+    ]
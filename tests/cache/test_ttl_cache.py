@@ -0,0 +1,51 @@
+"""Module for testing the in-memory TTL cache."""
+
+from freezegun import freeze_time
+from datetime import timedelta
+
+from src.service.cache import TTLCache
+
+
+def test_cache_hits_and_misses() -> None:
+    """Test the cache counters on hits and misses."""
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("foo", 1)
+
+    assert cache.get("foo") == 1
+    assert cache.get("bar") is None
+    assert cache.stats == {"hits": 1, "misses": 1, "evictions": 0, "size": 1}
+
+
+def test_cache_lru_eviction() -> None:
+    """Test that the least recently used entry is evicted when full."""
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("foo", 1)
+    cache.set("bar", 2)
+    cache.get("foo")
+    cache.set("baz", 3)
+
+    assert cache.get("bar") is None
+    assert cache.get("foo") == 1
+    assert cache.get("baz") == 3
+    assert cache.stats["evictions"] == 1
+
+
+def test_cache_ttl_expiration() -> None:
+    """Test that entries expire at the smallest of the entry and default ttl."""
+    cache = TTLCache(max_size=2, ttl=60)
+    with freeze_time() as frozen_time:
+        cache.set("foo", 1, ttl=5)
+        cache.set("bar", 2, ttl=600)
+        frozen_time.tick(timedelta(seconds=10))
+        assert cache.get("foo") is None
+        assert cache.get("bar") == 2
+        frozen_time.tick(timedelta(seconds=60))
+        assert cache.get("bar") is None
+
+
+def test_cache_disabled() -> None:
+    """Test that a cache with max size zero stores nothing."""
+    cache = TTLCache(max_size=0, ttl=60)
+    cache.set("foo", 1)
+
+    assert cache.get("foo") is None
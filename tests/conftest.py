@@ -7,6 +7,8 @@ from httpx import ASGITransport, AsyncClient
 from src.app.main import app
 from src.app.settings import entry_settings
 from src.database.database import Database
+from src.service.access_groups import AccessGroupsService
+from src.service.rate_limit import LoginRateLimiter
 
 app_url = f"http://{entry_settings.APP_HOST}:{entry_settings.APP_PORT}/api"
 
@@ -21,6 +23,8 @@ async def drop_tables_after_tests():
 @pytest_asyncio.fixture(scope="function")
 async def client():
     """Fixture for the async HTTP client with lifespan management."""
+    LoginRateLimiter.clear()
+    AccessGroupsService.group_cache.clear()
     async with LifespanManager(app) as manager:
         async with AsyncClient(
             transport=ASGITransport(app=manager.app), base_url=app_url
@@ -0,0 +1,44 @@
+"""Module for testing the database settings and engine tuning."""
+
+import pytest
+from pathlib import Path
+from sqlalchemy import text
+
+from src.database.database import build_engine
+from src.database.settings import DATABASE_PROFILES, DatabaseSettings
+
+
+def test_high_throughput_profile() -> None:
+    """Test that the profile fills only the settings not given explicitly."""
+    settings = DatabaseSettings(DB_PROFILE="high-throughput", DB_POOL_SIZE=7)
+    profile = DATABASE_PROFILES["high-throughput"]
+
+    assert settings.DB_POOL_SIZE == 7
+    assert settings.DB_MAX_OVERFLOW == profile["DB_MAX_OVERFLOW"]
+    assert settings.SQLITE_MMAP_SIZE == profile["SQLITE_MMAP_SIZE"]
+
+
+@pytest.mark.asyncio
+async def test_sqlite_pragmas_and_pool(tmp_path: Path) -> None:
+    """Test that the pragmas are applied on connect and the pool is sized.
+
+    Args:
+        tmp_path (Path): Temporary directory for the database.
+    """
+    settings = DatabaseSettings(
+        CONN_URL=f"sqlite+aiosqlite:///{tmp_path / 'tuned.sql'}",
+        DB_PROFILE="high-throughput",
+    )
+    engine = build_engine(settings)
+    try:
+        async with engine.connect() as conn:
+            journal_mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+            synchronous = (await conn.execute(text("PRAGMA synchronous"))).scalar()
+            busy_timeout = (await conn.execute(text("PRAGMA busy_timeout"))).scalar()
+    finally:
+        await engine.dispose()
+
+    assert journal_mode == "wal"
+    assert synchronous == 1
+    assert busy_timeout == settings.SQLITE_BUSY_TIMEOUT
+    assert engine.pool.size() == settings.DB_POOL_SIZE
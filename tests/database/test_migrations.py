@@ -0,0 +1,121 @@
+"""Module for testing the database migrations."""
+
+from pathlib import Path
+from uuid import uuid4
+from sqlalchemy import create_engine, inspect, text
+
+from src.database.migrations import Migrations
+from src.database.tables import jwts_table
+from src.service.utils import UtilsService
+
+
+def test_drop_signature_digest(tmp_path: Path) -> None:
+    """Test dropping the signature digest of a jwts table, with the tokens that
+    were issued twice with the same signature.
+
+    Args:
+        tmp_path (Path): Temporary directory for the legacy database.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.sql'}")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE jwts (id CHAR(32) PRIMARY KEY, access_group CHAR(32), "
+                "signature TEXT, valid_until DATETIME, date_created DATETIME, "
+                "last_refresh DATETIME, times_refreshed INTEGER, "
+                "signature_digest BLOB)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE UNIQUE INDEX ix_jwts_signature_digest "
+                "ON jwts (signature_digest)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE INDEX ix_jwts_access_group_signature_digest "
+                "ON jwts (access_group, signature_digest)"
+            )
+        )
+        conn.execute(
+            text("INSERT INTO jwts (id, signature) VALUES (:id, :signature)"),
+            [
+                {"id": uuid4().hex, "signature": "same-second-signature"},
+                {"id": uuid4().hex, "signature": "same-second-signature"},
+                {"id": uuid4().hex, "signature": "other-signature"},
+            ],
+        )
+
+    for _ in range(2):
+        with engine.begin() as conn:
+            Migrations.drop_signature_digest(conn)
+            Migrations.create_missing_indexes(conn)
+    with engine.begin() as conn:
+        columns = {column["name"] for column in inspect(conn).get_columns("jwts")}
+        indexes = {index["name"] for index in inspect(conn).get_indexes("jwts")}
+        count = conn.execute(text("SELECT COUNT(*) FROM jwts")).scalar_one()
+
+    assert "signature_digest" not in columns
+    assert indexes == {"ix_jwts_valid_until"}
+    assert count == 3
+
+
+def test_convert_token_times(tmp_path: Path) -> None:
+    """Test converting the datetimes of a legacy jwts table to epoch seconds.
+
+    Args:
+        tmp_path (Path): Temporary directory for the legacy database.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.sql'}")
+    token_ids = sorted(uuid4() for _ in range(3))
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE jwts (id CHAR(32) PRIMARY KEY, access_group CHAR(32), "
+                "signature TEXT, signature_digest BLOB, valid_until DATETIME, "
+                "date_created DATETIME, last_refresh DATETIME, "
+                "times_refreshed INTEGER)"
+            )
+        )
+        conn.execute(text("CREATE INDEX ix_jwts_valid_until ON jwts (valid_until)"))
+        conn.execute(
+            text(
+                "INSERT INTO jwts VALUES (:id, :access_group, :signature, :digest, "
+                "'2025-01-01 00:05:00.000000', '2025-01-01 00:00:00.000000', "
+                ":last_refresh, 1)"
+            ),
+            [
+                {
+                    "id": token_id.hex,
+                    "access_group": uuid4().hex,
+                    "signature": f"legacy-signature-{index}",
+                    "digest": UtilsService.get_signature_digest(
+                        f"legacy-signature-{index}"
+                    ),
+                    "last_refresh": "2025-01-01 00:01:00.000000" if index else None,
+                }
+                for index, token_id in enumerate(token_ids)
+            ],
+        )
+
+    Migrations.BACKFILL_CHUNK_SIZE, chunk_size = 2, Migrations.BACKFILL_CHUNK_SIZE
+    try:
+        with engine.begin() as conn:
+            Migrations.convert_token_times(conn)
+            Migrations.create_missing_indexes(conn)
+        with engine.begin() as conn:
+            Migrations.convert_token_times(conn)
+            rows = conn.execute(jwts_table.select().order_by(jwts_table.c.id)).all()
+            tables = inspect(conn).get_table_names()
+            indexes = {index["name"] for index in inspect(conn).get_indexes("jwts")}
+    finally:
+        Migrations.BACKFILL_CHUNK_SIZE = chunk_size
+
+    # The naive datetimes were the America/Sao_Paulo wall time, UTC-3
+    assert [row.id for row in rows] == token_ids
+    assert {row.date_created for row in rows} == {1735700400}
+    assert {row.valid_until for row in rows} == {1735700700}
+    assert [row.last_refresh for row in rows] == [None, 1735700460, 1735700460]
+    assert tables == ["jwts"]
+    assert "ix_jwts_valid_until" in indexes
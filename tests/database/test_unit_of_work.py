@@ -0,0 +1,173 @@
+"""Module for testing the request unit of work of the database."""
+
+import asyncio
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy import event, select
+
+from src.database.database import Database, ReadOnlyTransactionError
+from src.database.tables import access_groups_table
+from src.schema.passw import PasswordHandler
+from src.service.access_groups import AccessGroupsService
+from src.service.utils import UtilsService
+
+
+def insert_group(email: str):
+    """Build the insert of an access group.
+
+    Args:
+        email (str): The group email.
+
+    Returns:
+        Insert: The insert query.
+    """
+    return access_groups_table.insert().values(
+        id=UtilsService.create_uuid(),
+        name="Test Unit Of Work",
+        email=email,
+        password="hashed-password",
+        date_created=UtilsService.get_current_datetime(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_transaction_shares_connection(client: AsyncClient) -> None:
+    """Test that the operations of a unit of work share one connection.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture, creating the tables.
+    """
+    checkouts = []
+    pool = Database.engine.sync_engine.pool
+
+    def on_checkout(*args) -> None:
+        checkouts.append(True)
+
+    event.listen(pool, "checkout", on_checkout)
+    try:
+        query = select(access_groups_table.c.id).where(
+            access_groups_table.c.email == "unit-of-work@example.com"
+        )
+        async with Database.transaction():
+            assert checkouts == []
+            assert await Database.fetch_one(query) is None
+            await Database.execute(insert_group("unit-of-work@example.com"))
+            assert await Database.fetch_one(query) is not None
+        assert len(checkouts) == 1
+
+        assert await Database.fetch_one(query) is not None
+        assert len(checkouts) == 2
+    finally:
+        event.remove(pool, "checkout", on_checkout)
+
+
+@pytest.mark.asyncio
+async def test_transaction_rollback(client: AsyncClient) -> None:
+    """Test that a unit of work is rolled back when it raises.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture, creating the tables.
+    """
+    query = select(access_groups_table.c.id).where(
+        access_groups_table.c.email == "rolled-back@example.com"
+    )
+    with pytest.raises(ValueError):
+        async with Database.transaction():
+            await Database.execute(insert_group("rolled-back@example.com"))
+            raise ValueError()
+
+    assert await Database.fetch_one(query) is None
+
+
+@pytest.mark.asyncio
+async def test_read_only_transaction(client: AsyncClient) -> None:
+    """Test that a read-only unit of work rejects writes.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture, creating the tables.
+    """
+    async with Database.transaction(read_only=True):
+        await Database.fetch_all(select(access_groups_table.c.id))
+        with pytest.raises(ReadOnlyTransactionError):
+            await Database.execute(insert_group("read-only@example.com"))
+        with pytest.raises(ReadOnlyTransactionError):
+            async with Database.transaction():
+                pass
+
+
+@pytest.mark.asyncio
+async def test_write_transactions_queued(client: AsyncClient) -> None:
+    """Test that the SQLite write transactions wait for the one in progress.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture, creating the tables.
+    """
+    events = []
+
+    async def write(email: str) -> None:
+        async with Database.transaction():
+            await Database.execute(insert_group(email))
+            events.append(f"wrote {email}")
+            await asyncio.sleep(0.01)
+            events.append(f"committing {email}")
+
+    await asyncio.gather(
+        write("queued-first@example.com"), write("queued-second@example.com")
+    )
+
+    assert Database.serialize_writes
+    assert events == [
+        "wrote queued-first@example.com",
+        "committing queued-first@example.com",
+        "wrote queued-second@example.com",
+        "committing queued-second@example.com",
+    ]
+    assert not Database.get_write_lock().locked()
+
+
+@pytest.mark.asyncio
+async def test_login_unit_of_work(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a login releases its connection while verifying the password,
+    then saves the rehash and the token on one connection.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+        monkeypatch (pytest.MonkeyPatch): Fixture to patch the password handler.
+    """
+    group_data = {
+        "name": "Test Login Unit Of Work",
+        "email": "login-unit-of-work@example.com",
+        "password": "securepassword123",
+    }
+    response = await client.post("/access-groups/", json=group_data)
+    assert response.status_code == status.HTTP_201_CREATED
+    AccessGroupsService.group_cache.clear()
+
+    pool = Database.engine.sync_engine.pool
+    verify_and_update = PasswordHandler.verify_and_update_async
+    held_while_verifying = []
+
+    async def check_verify(password: str, hashed_password: str):
+        held_while_verifying.append(pool.checkedout())
+        is_valid, _ = await verify_and_update(password, hashed_password)
+        return is_valid, PasswordHandler.hash_password(password)
+
+    monkeypatch.setattr(PasswordHandler, "verify_and_update_async", check_verify)
+    checkouts = []
+
+    def on_checkout(*args) -> None:
+        checkouts.append(True)
+
+    event.listen(pool, "checkout", on_checkout)
+    try:
+        jwt_request = {"email": group_data["email"], "password": group_data["password"]}
+        response = await client.post("/auth/", json=jwt_request)
+    finally:
+        event.remove(pool, "checkout", on_checkout)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert held_while_verifying == [0]
+    assert len(checkouts) == 2
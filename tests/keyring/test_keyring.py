@@ -0,0 +1,173 @@
+"""Module for testing the signing keyring and the JWKS endpoint."""
+
+import jwt
+import pytest
+from pathlib import Path
+from fastapi import status
+from httpx import AsyncClient
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from src.app.settings import entry_settings, jwt_settings
+from src.service.keyring import Keyring
+
+
+def write_private_key(path: Path, private_key) -> str:
+    """Write a private key as PEM.
+
+    Args:
+        path (Path): The file path.
+        private_key (): The private key.
+
+    Returns:
+        str: The file path.
+    """
+    path.write_bytes(
+        private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+    )
+    return str(path)
+
+
+@pytest.fixture
+def restore_keyring():
+    """Fixture to restore the keyring loaded before the test."""
+    loaded = (Keyring.active, Keyring.keys, Keyring.jwks, Keyring.jwks_etag)
+    yield
+    Keyring.active, Keyring.keys, Keyring.jwks, Keyring.jwks_etag = loaded
+
+
+@pytest.mark.parametrize(
+    "algorithm, private_key",
+    [
+        ("RS256", rsa.generate_private_key(public_exponent=65537, key_size=2048)),
+        ("ES256", ec.generate_private_key(ec.SECP256R1())),
+        ("EdDSA", ed25519.Ed25519PrivateKey.generate()),
+    ],
+)
+def test_asymmetric_signing_with_key_rotation(
+    algorithm: str,
+    private_key,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    restore_keyring: None,
+) -> None:
+    """Test that tokens of a retiring key are still verified after a rotation.
+
+    Args:
+        algorithm (str): The signing algorithm.
+        private_key (): The first private key.
+        tmp_path (Path): Temporary directory for the keys.
+        monkeypatch (pytest.MonkeyPatch): Fixture to patch the settings.
+        restore_keyring (None): Fixture to restore the default keyring.
+    """
+    monkeypatch.setattr(jwt_settings, "JWT_ALGORITHM", algorithm)
+    old_path = write_private_key(tmp_path / "old.pem", private_key)
+    monkeypatch.setattr(jwt_settings, "JWT_PRIVATE_KEY_PATH", old_path)
+    Keyring.load()
+    token = Keyring.encode({"sub": "foo"})
+    assert jwt.get_unverified_header(token)["kid"] == "old"
+
+    new_key = ed25519.Ed25519PrivateKey.generate()
+    monkeypatch.setattr(jwt_settings, "JWT_ALGORITHM", "EdDSA")
+    new_path = write_private_key(tmp_path / "new.pem", new_key)
+    monkeypatch.setattr(jwt_settings, "JWT_PRIVATE_KEY_PATH", new_path)
+    monkeypatch.setattr(jwt_settings, "JWT_RETIRING_KEY_PATHS", [old_path])
+    Keyring.load()
+
+    assert Keyring.decode(token) == {"sub": "foo"}
+    assert jwt.get_unverified_header(Keyring.encode({}))["kid"] == "new"
+    jwks = jwt.PyJWKSet.from_json(Keyring.jwks.decode())
+    assert {key.key_id for key in jwks.keys} == {"old", "new"}
+
+
+def test_retiring_key_id_and_curve(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    restore_keyring: None,
+) -> None:
+    """Test the configured kid of a retiring key and the algorithm of its curve.
+
+    Args:
+        tmp_path (Path): Temporary directory for the keys.
+        monkeypatch (pytest.MonkeyPatch): Fixture to patch the settings.
+        restore_keyring (None): Fixture to restore the default keyring.
+    """
+    monkeypatch.setattr(jwt_settings, "JWT_ALGORITHM", "ES384")
+    monkeypatch.setattr(jwt_settings, "JWT_KEY_ID", "2026-04")
+    old_path = write_private_key(
+        tmp_path / "current.pem", ec.generate_private_key(ec.SECP384R1())
+    )
+    monkeypatch.setattr(jwt_settings, "JWT_PRIVATE_KEY_PATH", old_path)
+    Keyring.load()
+    token = Keyring.encode({"sub": "foo"})
+    assert jwt.get_unverified_header(token) == {
+        "alg": "ES384",
+        "kid": "2026-04",
+        "typ": "JWT",
+    }
+
+    monkeypatch.setattr(jwt_settings, "JWT_ALGORITHM", "ES512")
+    monkeypatch.setattr(jwt_settings, "JWT_KEY_ID", "2026-10")
+    new_path = write_private_key(
+        tmp_path / "next.pem", ec.generate_private_key(ec.SECP521R1())
+    )
+    monkeypatch.setattr(jwt_settings, "JWT_PRIVATE_KEY_PATH", new_path)
+    monkeypatch.setattr(jwt_settings, "JWT_RETIRING_KEY_PATHS", [f"2026-04:{old_path}"])
+    Keyring.load()
+    assert Keyring.decode(token) == {"sub": "foo"}
+    assert Keyring.keys["2026-04"].algorithm == "ES384"
+
+    monkeypatch.setattr(jwt_settings, "JWT_ALGORITHM", "ES256")
+    with pytest.raises(ValueError, match="signs with ES512"):
+        Keyring.load()
+
+    unsupported_path = write_private_key(
+        tmp_path / "k1.pem", ec.generate_private_key(ec.SECP256K1())
+    )
+    monkeypatch.setattr(jwt_settings, "JWT_ALGORITHM", "ES512")
+    monkeypatch.setattr(jwt_settings, "JWT_RETIRING_KEY_PATHS", [unsupported_path])
+    with pytest.raises(ValueError, match="Unsupported elliptic curve secp256k1"):
+        Keyring.load()
+
+
+@pytest.mark.asyncio
+async def test_get_jwks(
+    client: AsyncClient,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    restore_keyring: None,
+) -> None:
+    """Test the cacheable JWKS endpoint.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+        tmp_path (Path): Temporary directory for the keys.
+        monkeypatch (pytest.MonkeyPatch): Fixture to patch the settings.
+        restore_keyring (None): Fixture to restore the default keyring.
+    """
+    url = f"http://{entry_settings.APP_HOST}:{entry_settings.APP_PORT}"
+    url += "/.well-known/jwks.json"
+    response = await client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"keys": []}
+
+    monkeypatch.setattr(jwt_settings, "JWT_ALGORITHM", "ES256")
+    path = write_private_key(
+        tmp_path / "active.pem", ec.generate_private_key(ec.SECP256R1())
+    )
+    monkeypatch.setattr(jwt_settings, "JWT_PRIVATE_KEY_PATH", path)
+    Keyring.load()
+
+    response = await client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["Cache-Control"].startswith("public, max-age=")
+    assert [key["kid"] for key in response.json()["keys"]] == ["active"]
+
+    response = await client.get(
+        url, headers={"If-None-Match": response.headers["ETag"]}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
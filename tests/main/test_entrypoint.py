@@ -0,0 +1,68 @@
+"""Module for testing the service entrypoint."""
+
+import os
+import pytest
+
+import entrypoint
+from src.app.settings import entry_settings, store_settings
+from src.database.settings import database_settings
+
+
+def test_start_app(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the schema is initialized once before starting the workers.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): Fixture to patch uvicorn and settings.
+    """
+    migrations = []
+    calls = []
+
+    async def init_database() -> None:
+        migrations.append(True)
+
+    def run(**kwargs) -> None:
+        calls.append((kwargs["workers"], os.environ["DB_INIT_ON_STARTUP"]))
+
+    monkeypatch.setenv("DB_INIT_ON_STARTUP", "true")
+    monkeypatch.setattr(entrypoint, "init_database", init_database)
+    monkeypatch.setattr(database_settings, "DB_INIT_ON_STARTUP", True)
+    monkeypatch.setattr(entry_settings, "APP_WORKERS", 4)
+    monkeypatch.setattr(store_settings, "TOKEN_STORE", "sql")
+    monkeypatch.setattr(entrypoint.uvicorn, "run", run)
+
+    entrypoint.start_app()
+
+    assert migrations == [True]
+    assert calls == [(4, "false")]
+
+    monkeypatch.setattr(store_settings, "TOKEN_STORE", "memory")
+    assert entrypoint.get_workers() == 1
+
+
+def test_migrate_command(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the schema is only initialized by the migrate command when
+    the implicit initialization is disabled.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): Fixture to patch uvicorn and settings.
+    """
+    migrations = []
+    calls = []
+
+    async def init_database() -> None:
+        migrations.append(True)
+
+    monkeypatch.setenv("DB_INIT_ON_STARTUP", "false")
+    monkeypatch.setattr(entrypoint, "init_database", init_database)
+    monkeypatch.setattr(database_settings, "DB_INIT_ON_STARTUP", False)
+    monkeypatch.setattr(
+        entrypoint.uvicorn, "run", lambda **kwargs: calls.append(kwargs)
+    )
+
+    assert entrypoint.main(["serve"]) == 0
+    assert migrations == []
+    assert len(calls) == 1
+
+    assert entrypoint.main(["migrate"]) == 0
+    assert migrations == [True]
+    assert len(calls) == 1
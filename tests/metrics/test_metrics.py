@@ -0,0 +1,74 @@
+"""Module for testing the metrics."""
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+from src.app.metrics import Histogram
+from src.app.settings import entry_settings, metrics_settings
+from src.exceptions.metrics import MetricsUnauthorizedException
+
+
+def test_histogram_render() -> None:
+    """Test that histograms are rendered with cumulative buckets."""
+    histogram = Histogram("test_seconds", "Test latency.", ("operation",), (0.1, 1.0))
+    histogram.observe(0.05, operation="read")
+    histogram.observe(0.5, operation="read")
+    histogram.observe(2.0, operation="read")
+
+    assert histogram.render() == [
+        "# HELP test_seconds Test latency.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{operation="read",le="0.1"} 1',
+        'test_seconds_bucket{operation="read",le="1.0"} 2',
+        'test_seconds_bucket{operation="read",le="+Inf"} 3',
+        'test_seconds_sum{operation="read"} 2.55',
+        'test_seconds_count{operation="read"} 3',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_metrics_route(client: AsyncClient) -> None:
+    """Test that the metrics endpoint exposes the route and service metrics.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+    """
+    response = await client.get("/access-groups/")
+    assert response.status_code == status.HTTP_200_OK
+
+    url = f"http://{entry_settings.APP_HOST}:{entry_settings.APP_PORT}/metrics"
+    response = await client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain")
+
+    body = response.text
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/api/access-groups/",'
+        in body
+    )
+    assert "db_query_duration_seconds_bucket" in body
+    assert 'token_cache_requests_total{result="hit"}' in body
+    assert "password_jobs_in_flight 0" in body
+
+
+@pytest.mark.asyncio
+async def test_metrics_token(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the metrics endpoint requires the token, when one is set.
+
+    Args:
+        client (AsyncClient): The async httpx Client fixture for making requests.
+        monkeypatch (pytest.MonkeyPatch): Fixture to patch the settings.
+    """
+    monkeypatch.setattr(metrics_settings, "METRICS_TOKEN", "secret")
+    url = f"http://{entry_settings.APP_HOST}:{entry_settings.APP_PORT}/metrics"
+
+    for headers in [{}, {"Authorization": "Bearer wrong"}]:
+        response = await client.get(url, headers=headers)
+        assert response.status_code == MetricsUnauthorizedException.STATUS_CODE
+        assert response.headers["WWW-Authenticate"] == "Bearer"
+
+    response = await client.get(url, headers={"Authorization": "Bearer secret"})
+    assert response.status_code == status.HTTP_200_OK
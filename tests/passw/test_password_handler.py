@@ -0,0 +1,67 @@
+"""Module for testing the password handler."""
+
+import pytest
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+from src.app.settings import password_settings
+from src.exceptions.passw import PasswordQueueFullException
+from src.schema.passw import PasswordHandler
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_password_async() -> None:
+    """Test hashing and verifying a password in the worker pool."""
+    hashed = await PasswordHandler.hash_password_async("securepassword123")
+
+    assert hashed != "securepassword123"
+    assert await PasswordHandler.verify_password_async("securepassword123", hashed)
+    assert not await PasswordHandler.verify_password_async("wrongpassword", hashed)
+
+
+@pytest.mark.asyncio
+async def test_password_queue_full(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that jobs are rejected when the worker pool queue is full.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): Fixture to patch the settings.
+    """
+    monkeypatch.setattr(password_settings, "PASSWORD_QUEUE_SIZE", 0)
+    monkeypatch.setattr(
+        PasswordHandler, "_in_flight", password_settings.PASSWORD_WORKERS
+    )
+
+    with pytest.raises(PasswordQueueFullException):
+        await PasswordHandler.hash_password_async("securepassword123")
+
+
+@pytest.mark.asyncio
+async def test_verify_and_update_password(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that hashes with outdated cost parameters are rehashed.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): Fixture to patch the hasher.
+    """
+    hashed = await PasswordHandler.hash_password_async("securepassword123")
+    assert await PasswordHandler.verify_and_update_async(
+        "securepassword123", hashed
+    ) == (True, None)
+
+    monkeypatch.setattr(
+        PasswordHandler,
+        "password_hasher",
+        PasswordHash((Argon2Hasher(time_cost=1, memory_cost=8192, parallelism=1),)),
+    )
+    is_valid, updated_hash = await PasswordHandler.verify_and_update_async(
+        "securepassword123", hashed
+    )
+
+    assert is_valid
+    assert "m=8192,t=1,p=1" in updated_hash
+    assert await PasswordHandler.verify_password_async(
+        "securepassword123", updated_hash
+    )
+    assert await PasswordHandler.verify_and_update_async("wrongpassword", hashed) == (
+        False,
+        None,
+    )
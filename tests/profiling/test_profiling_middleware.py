@@ -0,0 +1,68 @@
+"""Module for testing the profiling middleware."""
+
+import pytest
+import pytest_asyncio
+from pathlib import Path
+from fastapi import status
+from httpx import ASGITransport, AsyncClient
+from asgi_lifespan import LifespanManager
+
+from src.app.main import app
+from src.app.profiling import ProfilingMiddleware
+from src.app.settings import profiling_settings
+
+
+@pytest_asyncio.fixture(scope="function")
+async def profiled_client():
+    """Fixture for a client of the app wrapped by the profiling middleware."""
+    async with LifespanManager(app) as manager:
+        transport = ASGITransport(app=ProfilingMiddleware(manager.app))
+        async with AsyncClient(
+            transport=transport, base_url="http://test/api"
+        ) as http_client:
+            yield http_client
+
+
+@pytest.mark.asyncio
+async def test_profile_inline(
+    profiled_client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a request asking for a profile gets the report back.
+
+    Args:
+        profiled_client (AsyncClient): Client of the profiled app.
+        monkeypatch (pytest.MonkeyPatch): Fixture to patch the settings.
+    """
+    monkeypatch.setattr(profiling_settings, "PROFILING_TOKEN", "secret")
+
+    response = await profiled_client.get("/", headers={"X-Profile": "wrong"})
+    assert response.json() == {"message": "The JWT Auth Service is running!"}
+
+    response = await profiled_client.get("/", headers={"X-Profile": "secret"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["x-profile-status"] == "200"
+    assert "wall time:" in response.text
+    assert "cumulative" in response.text
+
+
+@pytest.mark.asyncio
+async def test_profile_to_directory(
+    profiled_client: AsyncClient, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Test that sampled requests are profiled to the profiling directory.
+
+    Args:
+        profiled_client (AsyncClient): Client of the profiled app.
+        monkeypatch (pytest.MonkeyPatch): Fixture to patch the settings.
+        tmp_path (Path): Temporary profiling directory.
+    """
+    monkeypatch.setattr(profiling_settings, "PROFILING_DIR", str(tmp_path))
+    monkeypatch.setattr(profiling_settings, "PROFILING_SAMPLE_RATE", 1.0)
+
+    response = await profiled_client.get("/")
+    assert response.json() == {"message": "The JWT Auth Service is running!"}
+
+    path = Path(response.headers["x-profile-path"])
+    assert path.parent == tmp_path
+    assert path.exists()
+    assert "wall time:" in Path(f"{path}.txt").read_text()
@@ -0,0 +1,30 @@
+"""Module for testing the rate limiters."""
+
+from freezegun import freeze_time
+
+from src.service.rate_limit import TokenBucketLimiter
+
+
+def test_token_bucket_limiter() -> None:
+    """Test the burst, refill and bounded size of the token buckets."""
+    limiter = TokenBucketLimiter(burst=2, refill=0.5, max_keys=2)
+
+    with freeze_time() as frozen_time:
+        assert limiter.acquire("a") == 0
+        assert limiter.acquire("a") == 0
+        assert limiter.acquire("a") == 2.0
+
+        frozen_time.tick(2)
+        assert limiter.acquire("a") == 0
+        assert limiter.acquire("a") > 0
+
+        assert limiter.acquire("b") == 0
+        assert limiter.acquire("c") == 0
+
+        limiter.refund("c")
+        limiter.refund("c")
+        assert limiter.acquire("c") == 0
+        assert limiter.acquire("c") == 0
+        assert limiter.acquire("c") > 0
+
+    assert limiter.stats == {"allowed": 7, "rejected": 3, "keys": 2}
@@ -0,0 +1,74 @@
+"""Module for testing the sharded in-memory token store."""
+
+import json
+import pytest
+from uuid import uuid4
+from pathlib import Path
+
+from src.schema.auth import Jwt
+from src.service.utils import UtilsService
+from src.store.memory import MemoryTokenStore
+
+
+@pytest.mark.asyncio
+async def test_memory_store_snapshot(tmp_path: Path) -> None:
+    """Test that the tokens survive a restart through the snapshot file.
+
+    Args:
+        tmp_path (Path): Temporary directory for the snapshot.
+    """
+    snapshot_path = str(tmp_path / "tokens.json")
+    now = UtilsService.get_int_timestamp()
+    token = Jwt(
+        id=uuid4(),
+        access_group=uuid4(),
+        signature="snapshot-signature",
+        valid_until=now,
+        date_created=now,
+        times_refreshed=0,
+    )
+
+    store = MemoryTokenStore(shards=4, snapshot_path=snapshot_path)
+    await store.start()
+    await store.issue([token])
+    await store.stop()
+
+    restarted = MemoryTokenStore(shards=8, snapshot_path=snapshot_path)
+    await restarted.start()
+    try:
+        assert await restarted.lookup([token.id]) == {token.id: token}
+    finally:
+        await restarted.stop()
+
+
+@pytest.mark.asyncio
+async def test_memory_store_legacy_snapshot(tmp_path: Path) -> None:
+    """Test that the datetimes of an older snapshot are loaded as epoch seconds.
+
+    Args:
+        tmp_path (Path): Temporary directory for the snapshot.
+    """
+    snapshot_path = tmp_path / "tokens.json"
+    token_id = uuid4()
+    legacy_token = {
+        "id": str(token_id),
+        "access_group": str(uuid4()),
+        "signature": "legacy-signature",
+        "valid_until": "2025-01-01T00:05:00",
+        "date_created": "2025-01-01T00:00:00",
+        "last_refresh": None,
+        "times_refreshed": 0,
+    }
+    snapshot_path.write_text(json.dumps([legacy_token]))
+
+    store = MemoryTokenStore(shards=4, snapshot_path=str(snapshot_path))
+    await store.start()
+    try:
+        token = (await store.lookup([token_id]))[token_id]
+    finally:
+        await store.stop()
+
+    # The naive datetimes were the America/Sao_Paulo wall time, UTC-3
+    assert token.date_created == 1735700400
+    assert token.valid_until == token.date_created + 300
+    assert token.last_refresh is None